@@ -0,0 +1,68 @@
+"""
+Agent dispatch tables and concurrency limits shared by the orchestrating workflows.
+
+Importing this package registers every task agent with `utils.decorators`.
+"""
+
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from config import MAX_CONCURRENT_AGENTS
+from agents.math_agent import math_agent
+from agents.string_agent import string_agent
+from agents.web_search_agent import web_search_agent
+from agents.code_agent import code_agent
+from agents.weather_agent import weather_agent
+
+# Agent name -> agent task, used to route plan steps
+AGENTS = {
+    "math": math_agent,
+    "string": string_agent,
+    "web_search": web_search_agent,
+    "code": code_agent,
+    "weather": weather_agent,
+}
+
+# Result attribute to pass downstream when it is not `final_result`
+# (web search results can be large, so its summary is used instead)
+SUMMARY_ATTRS = {
+    "web_search": "summary",
+}
+
+# Per-agent caps on concurrent calls, for agents with tighter upstream rate limits.
+# Agents not listed are only bound by MAX_CONCURRENT_AGENTS.
+AGENT_CONCURRENCY_LIMITS = {
+    "web_search": 4,
+}
+
+# Semaphores bind to the event loop they are first awaited on, so keep a set per loop
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _semaphore(key: str, limit: int) -> asyncio.Semaphore:
+    per_loop = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    if key not in per_loop:
+        per_loop[key] = asyncio.Semaphore(limit)
+    return per_loop[key]
+
+
+@asynccontextmanager
+async def agent_slot(agent_name: str):
+    """
+    Hold one global agent slot (and one per-agent slot, if limited) for a call.
+
+    A planner that emits dozens of parallel steps then queues them here instead
+    of firing every request at once.
+    """
+    # Take the per-agent slot first so calls queued behind it do not hold global slots
+    limit = AGENT_CONCURRENCY_LIMITS.get(agent_name)
+    if limit is None:
+        async with _semaphore("*", MAX_CONCURRENT_AGENTS):
+            yield
+    else:
+        async with _semaphore(agent_name, limit), _semaphore("*", MAX_CONCURRENT_AGENTS):
+            yield
@@ -3,11 +3,11 @@ This module defines the editor_agent, which can review and improve written conte
 """
 
 import flyte
-from openai import AsyncOpenAI
 
 from utils.decorators import agent
 from dataclasses import dataclass
-from config import base_env, OPENAI_API_KEY
+from config import base_env
+from utils.llm_client import get_openai_client
 
 # ----------------------------------
 # Agent-Specific Configuration
@@ -57,8 +57,8 @@ async def editor_agent(task: str) -> EditorAgentResult:
     """
     print(f"[Editor Agent] Processing: {task}")
 
-    # Initialize client inside task for Flyte secret injection
-    client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    # Shared per-loop client (created inside the task for Flyte secret injection)
+    client = get_openai_client()
 
     system_msg = """
 You are a professional content editor. Your job is to review and improve written content.
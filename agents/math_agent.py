@@ -77,8 +77,7 @@ Tools:
 CRITICAL: You must respond with ONLY a valid JSON array, nothing else. No markdown, no explanations.
 Return a JSON array of tool calls in this exact format:
 [
-  {{"tool": "add", "args": [2, 3], "reasoning": "Adding 2 and 3 to compute the sum."}},
-  {{"tool": "multiply", "args": ["previous", 5], "reasoning": "Multiplying previous result by 5."}}
+  {{"tool": "calc", "args": ["(2 + 3) * 5"], "reasoning": "Adding 2 and 3, then multiplying the sum by 5."}}
 ]
 
 RULES:
@@ -87,6 +86,7 @@ RULES:
 3. No extra text before or after the JSON
 4. Always include a "reasoning" field for each step
 5. Use "previous" in args to reference the previous step result
+6. Prefer a single "calc" call over chaining add/multiply/power
 """
 
     # Call LLM to create plan using agent-specific config
@@ -97,7 +97,7 @@ RULES:
         messages=[
             {"role": "system", "content": system_msg},
             {"role": "user", "content": "Add 2 and 3"},
-            {"role": "assistant", "content": '[{"tool": "add", "args": [2, 3], "reasoning": "Adding 2 and 3"}]'},
+            {"role": "assistant", "content": '[{"tool": "calc", "args": ["2 + 3"], "reasoning": "Adding 2 and 3"}]'},
             {"role": "user", "content": task}
         ]
     )
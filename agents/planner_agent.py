@@ -6,7 +6,7 @@ import json
 import flyte
 from openai import AsyncOpenAI
 from dataclasses import dataclass
-from typing import List
+from typing import List, Tuple
 
 from config import OPENAI_API_KEY
 from utils.decorators import agent, agent_registry
@@ -27,12 +27,11 @@ class AgentStep:
     """Single step in the execution plan"""
     agent: str
     task: str
-    dependencies: List[int] = None  # List of step indices this step depends on (0-indexed)
+    dependencies: Tuple[int, ...] = ()  # Indices of steps this step depends on (0-indexed)
 
     def __post_init__(self):
-        # Default to empty list if None
-        if self.dependencies is None:
-            self.dependencies = []
+        # Store as an immutable tuple (accepts None or any iterable of ints)
+        self.dependencies = tuple(self.dependencies or ())
 
 
 @dataclass
@@ -145,7 +144,7 @@ IMPORTANT: Always include 'dependencies' field for each step, even if empty [].
 
     print(f"[Planner Agent] Plan has {len(steps)} step(s)")
     for i, step in enumerate(steps, 1):
-        deps_str = f" (depends on: {step.dependencies})" if step.dependencies else " (no dependencies)"
+        deps_str = f" (depends on: {list(step.dependencies)})" if step.dependencies else " (no dependencies)"
         print(f"[Planner Agent]   Step {i}: {step.agent} - {step.task}{deps_str}")
 
     return PlannerDecision(steps=steps)
\ No newline at end of file
@@ -9,12 +9,12 @@ see web_search_reflexion_agent.py
 """
 
 import json
-from openai import AsyncOpenAI
 from dataclasses import dataclass
 
 from utils.decorators import agent, agent_tools
 from utils.plan_executor import execute_tool_plan, parse_plan_from_response
-from config import base_env, OPENAI_API_KEY
+from config import base_env
+from utils.llm_client import get_openai_client
 
 # Import tools to register them
 import tools.web_search_tools
@@ -66,8 +66,8 @@ async def web_search_agent(task: str) -> WebSearchAgentResult:
     """
     print(f"[Web Search Agent] Searching for: {task}")
 
-    # Initialize OpenAI client
-    client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    # Shared per-loop OpenAI client (keeps the connection pool warm across calls)
+    client = get_openai_client()
 
     # Get available tools
     toolset = agent_tools["web_search"]
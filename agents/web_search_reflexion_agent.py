@@ -3,6 +3,7 @@ This module defines the web_search_agent, which can search the web and fetch con
 """
 
 import json
+import re
 import flyte
 from openai import AsyncOpenAI
 
@@ -24,6 +25,9 @@ WEB_SEARCH_AGENT_CONFIG = {
     "max_tokens": 1000,
 }
 
+# JSON object inside a ```json fenced block, for evaluations wrapped in markdown
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
 # ----------------------------------
 # Data Models
 # ----------------------------------
@@ -170,8 +174,7 @@ If quality_score >= 8.0, set sufficient=true. Otherwise suggest 1-2 additional t
     try:
         eval_data = json.loads(raw_eval)
     except json.JSONDecodeError:
-        import re
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', raw_eval, re.DOTALL)
+        json_match = _JSON_FENCE_RE.search(raw_eval)
         if json_match:
             eval_data = json.loads(json_match.group(1))
         else:
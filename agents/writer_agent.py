@@ -3,12 +3,12 @@ This module defines the writer_agent, which can create written content based on
 """
 
 import flyte
-from openai import AsyncOpenAI
 import os
 
 from utils.decorators import agent
 from dataclasses import dataclass
-from config import base_env, OPENAI_API_KEY
+from config import base_env
+from utils.llm_client import get_openai_client
 
 # ----------------------------------
 # Agent-Specific Configuration
@@ -63,7 +63,7 @@ async def writer_agent(task: str) -> WriterAgentResult:
     """
     print(f"[Writer Agent] Processing: {task[:100]}...")
 
-    client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    client = get_openai_client()
 
     system_msg = """
 You are a professional content writer. Your job is to create well-structured, engaging content based on the research provided.
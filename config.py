@@ -1,4 +1,5 @@
 import os
+import sys
 from dotenv import load_dotenv
 import flyte
 
@@ -31,10 +32,35 @@ TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 
 # assert OPENAI_API_KEY is not None, "❌ OPENAI_API_KEY is not set!"
 
+# ----------------------------------
+# Model configuration
+# ----------------------------------
+# Point PLANNER_BASE_URL at any OpenAI-compatible server (e.g. a local vLLM
+# serving an FP8 model) and set the model names to what that server exposes.
+# Only the hybrid planner/reflection calls use it; agents and embeddings stay on
+# the default endpoint.
+PLANNER_BASE_URL = os.getenv("PLANNER_BASE_URL")  # None = default endpoint
+PLANNER_MODEL = os.getenv("PLANNER_MODEL", "gpt-4o")
+REFLECTION_MODEL = os.getenv("REFLECTION_MODEL", "gpt-4o-mini")
+# Reflexion critic: routine scoring on the small model, borderline scores re-checked on the large one
+CRITIC_MODEL = os.getenv("CRITIC_MODEL", "gpt-4o-mini")
+CRITIC_ESCALATE_MODEL = os.getenv("CRITIC_ESCALATE_MODEL", "gpt-4o")
+
+# ----------------------------------
+# Concurrency limits
+# ----------------------------------
+# Upper bound on agent calls running at once within one orchestrator process
+MAX_CONCURRENT_AGENTS = int(os.getenv("MAX_CONCURRENT_AGENTS", "8"))
+# Subtopics researched at once by the research report workflow
+RESEARCH_CONCURRENCY = int(os.getenv("RESEARCH_CONCURRENCY", "4"))
+
 # ----------------------------------
 # Database configuration
 # ----------------------------------
 
 # ----------------------------------
 # logging configuration
-# ----------------------------------
\ No newline at end of file
+# ----------------------------------
+# Decorative console output (banners, previews) for interactive runs; remote
+# runs stay quiet unless AGENT_VERBOSE=1
+VERBOSE = sys.stdout.isatty() or os.getenv("AGENT_VERBOSE") == "1"
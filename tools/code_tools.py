@@ -12,7 +12,8 @@ from typing import Optional
 async def execute_python(
     code: str,
     timeout: int = 5,
-    description: Optional[str] = None
+    description: Optional[str] = None,
+    include_traceback: bool = False
 ) -> dict:
     """
     Execute Python code in a safe, sandboxed environment.
@@ -21,6 +22,7 @@ async def execute_python(
         code (str): The Python code to execute.
         timeout (int): Maximum execution time in seconds (default: 5).
         description (str, optional): Description of what the code does.
+        include_traceback (bool): Append the full traceback to runtime errors (default: False).
 
     Returns:
         dict: Dictionary with 'output', 'result', 'error', and 'description' keys.
@@ -114,7 +116,9 @@ print(f"5! = {result}")
         }
 
     except Exception as e:
-        error_msg = f"Runtime Error: {str(e)}\n{traceback.format_exc()}"
+        # Formatting a traceback walks every frame, so only do it when asked
+        tb = traceback.format_exc() if include_traceback else ""
+        error_msg = f"Runtime Error: {e!r}" + (f"\n{tb}" if tb else "")
         print(f"[Execute Python] {error_msg}")
         return {
             "output": stdout_capture.getvalue(),
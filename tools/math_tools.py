@@ -1,6 +1,68 @@
 from utils.decorators import tool
+import ast
+import operator
 import flyte
 
+# Operators the calc tool is allowed to evaluate
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+    ast.Mod: operator.mod,
+}
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+MAX_EXPONENT = 1000
+
+
+def _eval_node(node, variables: dict):
+    """Recursively evaluate a whitelisted arithmetic AST node."""
+    if isinstance(node, ast.Expression):
+        return _eval_node(node.body, variables)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        # Floats only: Python ints grow without bound, so (10 ** 1000) ** 1000 would never finish
+        return float(node.value)
+    if isinstance(node, ast.Name):
+        if node.id not in variables:
+            raise ValueError(f"Unknown variable: {node.id}")
+        return float(variables[node.id])
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        left = _eval_node(node.left, variables)
+        right = _eval_node(node.right, variables)
+        # Float powers overflow instead of hanging; this also rejects absurd exponents early
+        if isinstance(node.op, ast.Pow) and abs(right) > MAX_EXPONENT:
+            raise ValueError(f"Exponent too large: {right}")
+        return _BIN_OPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand, variables))
+    raise ValueError(f"Unsupported expression element: {ast.dump(node)}")
+
+
+@tool(agent="math")
+@flyte.trace
+async def calc(expr: str, vars: dict = None) -> float:
+    """
+    Evaluates an arithmetic expression in a single step. Prefer this over chaining add/multiply/power.
+
+    Args:
+        expr (str): Expression using numbers, variable names, parentheses and + - * / ** %, e.g. "(2 + 3) * 5 ** 2".
+        vars (dict, optional): Values for variable names used in the expression, e.g. {"x": 4}.
+            A value of "previous" is replaced by the previous step's result, e.g. {"x": "previous"}.
+
+    Returns:
+        float: The value of the expression.
+    """
+    print(f"TOOL CALL: Calculating {expr}")
+    try:
+        return float(_eval_node(ast.parse(expr, mode="eval"), vars or {}))
+    except OverflowError as e:
+        raise ValueError(f"Result too large: {expr}") from e
+
+
 @tool(agent="math")
 @flyte.trace
 async def add(a: int|float, b: int|float) -> float:
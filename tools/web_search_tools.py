@@ -4,6 +4,7 @@ import flyte
 from typing import Optional
 import httpx
 from bs4 import BeautifulSoup
+from tavily import TavilyClient
 from config import TAVILY_API_KEY
 
 # ----------------------------------
@@ -31,8 +32,6 @@ async def tavily_search(
     Returns:
         dict: Dictionary with 'results' (list), 'answer' (str if include_answer=True), and 'query' (str).
     """
-    from tavily import TavilyClient
-
     tavily_client = TavilyClient(api_key=TAVILY_API_KEY)
     response = tavily_client.search(
         query=query,
@@ -119,6 +118,10 @@ async def duck_duck_go(
 # ----------------------------------
 # Webpage Fetching Tool
 # ----------------------------------
+# Raw HTML is much larger than the text it yields (markup, scripts, styles),
+# so read up to this many bytes per requested character of text.
+FETCH_BYTES_PER_CHAR = 8
+
 @tool(agent="web_search")
 @flyte.trace
 async def fetch_webpage(url: str, max_length: int = 5000) -> dict:
@@ -133,12 +136,23 @@ async def fetch_webpage(url: str, max_length: int = 5000) -> dict:
         dict: Dictionary with 'url', 'title', 'content', and 'error' keys.
     """
     try:
+        # Stream the body and stop once we have enough bytes to fill max_length
+        # chars of text - huge pages are never fully downloaded or parsed.
+        byte_cap = max_length * FETCH_BYTES_PER_CHAR
         async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            response = await client.get(url)
-            response.raise_for_status()
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                chunks = []
+                total = 0
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total >= byte_cap:
+                        break
+                body = b"".join(chunks).decode(response.encoding or "utf-8", "replace")
 
         # Parse HTML content
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(body, 'html.parser')
 
         # Remove script and style elements
         for script in soup(["script", "style", "nav", "footer", "header"]):
@@ -0,0 +1,50 @@
+"""
+Buffered console output for chatty workflows.
+
+Every `print()` takes the stdout lock and, in remote runs, becomes a separately
+streamed and persisted log line. ConsoleBuffer collects lines in memory and
+writes them with a single `sys.stdout.write` per `flush()`, which workflows call
+at phase boundaries (and before long awaits, so progress still shows up).
+
+    out = ConsoleBuffer()
+    out.banner("PHASE 1: RESEARCH")
+    out.print(f"Researching: {topic}")
+    out.flush()
+"""
+
+import io
+import sys
+
+BANNER_WIDTH = 80
+
+
+class ConsoleBuffer:
+    """In-memory stand-in for `print()` that writes to stdout only on flush."""
+
+    def __init__(self, stream=None, banners: bool = True):
+        self._stream = stream
+        self._banners = banners
+        self._buf = io.StringIO()
+
+    def print(self, *args, sep: str = " ", end: str = "\n"):
+        """Buffer a line, with the same argument handling as `print()`."""
+        self._buf.write(sep.join(map(str, args)))
+        self._buf.write(end)
+
+    def banner(self, title: str):
+        """Buffer a blank line and a title framed by '=' rules (no-op if banners are off)."""
+        if not self._banners:
+            return
+        rule = "=" * BANNER_WIDTH
+        self._buf.write(f"\n{rule}\n{title}\n{rule}\n")
+
+    def flush(self):
+        """Write everything buffered so far in one call and reset the buffer."""
+        text = self._buf.getvalue()
+        if not text:
+            return
+        stream = self._stream or sys.stdout
+        stream.write(text)
+        stream.flush()
+        self._buf.seek(0)
+        self._buf.truncate(0)
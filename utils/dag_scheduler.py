@@ -0,0 +1,146 @@
+"""
+Dependency-aware scheduling for agent execution plans.
+
+Plans are lists of steps whose `dependencies` are indices of earlier steps.
+Scheduling uses Kahn's algorithm: each step keeps an indegree counter and a
+reverse-adjacency list, so completing a step unblocks its children in O(1)
+instead of rescanning every pending step.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+def build_dependency_graph(steps: List[Any]) -> Tuple[List[int], List[List[int]]]:
+    """
+    Build indegree counters and children lists for a plan.
+
+    Dependencies that do not point at another step in the plan are ignored
+    with a warning rather than blocking the step forever.
+
+    Args:
+        steps: Plan steps, each with a `dependencies` list of step indices
+
+    Returns:
+        tuple: (indegree, children) where children[i] lists the steps waiting on step i
+    """
+    indegree = [0] * len(steps)
+    children: List[List[int]] = [[] for _ in steps]
+
+    for idx, step in enumerate(steps):
+        for dep_idx in step.dependencies:
+            if not 0 <= dep_idx < len(steps) or dep_idx == idx:
+                print(f"[Scheduler] WARNING: Step {idx} has invalid dependency {dep_idx}, ignoring it")
+                continue
+            indegree[idx] += 1
+            children[dep_idx].append(idx)
+
+    return indegree, children
+
+
+async def run_dag(
+    steps: List[Any],
+    execute_step: Callable[[int, Any], Awaitable[Any]],
+    completed: Dict[int, Any],
+    label: str = "[Scheduler]",
+    max_parallelism: Optional[int] = None,
+    graph: Optional[Tuple[List[int], List[List[int]]]] = None,
+    started: Optional[Dict[int, "asyncio.Task"]] = None,
+    is_error: Optional[Callable[[Any], bool]] = None,
+    make_skipped: Optional[Callable[[int, Any, int], Any]] = None
+) -> Dict[int, Any]:
+    """
+    Execute plan steps in dependency order with maximum parallelism.
+
+    There are no waves: a step is launched the moment its last dependency
+    finishes, so total latency follows the critical path rather than the
+    slowest step of each wave.
+
+    Args:
+        steps: Plan steps, each with a `dependencies` list of step indices
+        execute_step: Coroutine function (step_idx, step) -> result
+        completed: Dict that receives results by step index; execute_step can read
+            it to access dependency results
+        label: Prefix for progress messages
+        max_parallelism: Optional cap on concurrently running steps
+        graph: Optional (indegree, children) from build_dependency_graph, if the
+            caller already built it; it is consumed (indegree is decremented)
+        started: Optional tasks the caller already launched for dependency-free
+            steps (e.g. while the plan was still streaming), keyed by step index.
+            They are adopted instead of relaunched and do not take a semaphore slot.
+        is_error: Optional predicate on a step result. When it returns True, every
+            descendant of that step is skipped instead of executed.
+        make_skipped: Callable (step_idx, step, failed_idx) -> result stored for each
+            skipped descendant; required together with is_error
+
+    Returns:
+        dict: The `completed` dict. Steps on a dependency cycle are left out.
+    """
+    # Indegree sentinel for steps skipped because an ancestor failed
+    SKIPPED = -1
+
+    indegree, children = graph if graph is not None else build_dependency_graph(steps)
+    semaphore = asyncio.Semaphore(max_parallelism) if max_parallelism else None
+
+    async def run_one(step_idx: int) -> Any:
+        if semaphore is None:
+            return await execute_step(step_idx, steps[step_idx])
+        async with semaphore:
+            return await execute_step(step_idx, steps[step_idx])
+
+    running: Dict[asyncio.Task, int] = {}
+
+    def skip_descendants(failed_idx: int):
+        # BFS over children; descendants cannot be running since failed_idx never released them
+        queue = deque(children[failed_idx])
+        while queue:
+            child_idx = queue.popleft()
+            if indegree[child_idx] == SKIPPED:
+                continue
+            indegree[child_idx] = SKIPPED
+            completed[child_idx] = make_skipped(child_idx, steps[child_idx], failed_idx)
+            queue.extend(children[child_idx])
+        print(f"{label} Step {failed_idx} failed, skipping its dependent steps")
+
+    def launch(step_idx: int):
+        running[asyncio.create_task(run_one(step_idx))] = step_idx
+
+    started = dict(started or {})
+    initial = [idx for idx, degree in enumerate(indegree) if degree == 0]
+    print(f"{label} Starting {len(initial)} step(s) with no dependencies...")
+    for step_idx in initial:
+        if step_idx in started:
+            running[started.pop(step_idx)] = step_idx
+        else:
+            launch(step_idx)
+    # Anything else the caller started does not match a ready step; drop it
+    for task in started.values():
+        task.cancel()
+
+    try:
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step_idx = running.pop(task)
+                completed[step_idx] = task.result()
+                if is_error is not None and children[step_idx] and is_error(completed[step_idx]):
+                    skip_descendants(step_idx)
+                    continue
+                for child_idx in children[step_idx]:
+                    if indegree[child_idx] == SKIPPED:
+                        continue
+                    indegree[child_idx] -= 1
+                    if indegree[child_idx] == 0:
+                        print(f"{label} Step {child_idx} unblocked by step {step_idx}")
+                        launch(child_idx)
+    finally:
+        # If a step raised, do not leave its siblings running unattended
+        for task in running:
+            task.cancel()
+
+    blocked = [idx for idx, degree in enumerate(indegree) if degree > 0]
+    if blocked:
+        print(f"{label} ERROR: Steps {blocked} never became ready (circular dependency?)")
+
+    return completed
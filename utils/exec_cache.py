@@ -0,0 +1,100 @@
+"""
+In-process memoization of agent calls.
+
+Orchestrators often re-issue the same (agent, task) pair - e.g. the hybrid workflow
+re-planning a similar sub-task in a later iteration. Results are cached per process
+(LRU, bounded in size and age), and concurrent callers with the same key share a
+single in-flight call.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Bounds on cached results: entry count (least recently used evicted) and age in seconds
+EXEC_CACHE_MAX_ENTRIES = 256
+EXEC_CACHE_TTL = 3600
+
+# Finished results as (expires_at, result), loop-independent, and calls still in
+# flight (bound to their loop)
+_results: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+_inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+
+def normalize_task(task: str) -> str:
+    """Normalize a task string for use as a cache key (case and whitespace)."""
+    return " ".join(task.lower().split())
+
+
+async def memoize(
+    agent: str,
+    task: str,
+    coro_factory: Callable[[], Awaitable[Any]],
+    cache_if: Optional[Callable[[Any], bool]] = None
+) -> Any:
+    """
+    Run coro_factory() once per (agent, normalized task) and cache the result.
+
+    Failed calls are not cached, so a later call with the same key retries. If
+    the caller running the shared call is cancelled, callers that joined it
+    retry instead of being cancelled with it.
+
+    Args:
+        agent: Agent name
+        task: Task string sent to the agent
+        coro_factory: Zero-argument callable returning the agent coroutine
+        cache_if: Optional predicate; results for which it returns False are not
+            kept (e.g. agent results carrying an error message)
+
+    Returns:
+        The agent result (cached or freshly computed)
+    """
+    key = (agent, normalize_task(task))
+
+    cached = _results.get(key)
+    if cached is not None:
+        expires_at, result = cached
+        if time.monotonic() < expires_at:
+            _results.move_to_end(key)
+            print(f"[Exec Cache] Hit for {agent}: {task[:60]}...")
+            return result
+        del _results[key]
+
+    # The lookup and registration below contain no await, so they are atomic
+    # with respect to other coroutines on this event loop - no lock needed.
+    loop = asyncio.get_running_loop()
+    future = _inflight.get(key)
+    if future is not None and future.get_loop() is loop:
+        print(f"[Exec Cache] Joining in-flight call for {agent}: {task[:60]}...")
+        # asyncio.wait neither cancels the shared future when this caller is
+        # cancelled nor raises when the leader's call was cancelled
+        await asyncio.wait([future])
+        if future.cancelled():
+            return await memoize(agent, task, coro_factory, cache_if)
+        return future.result()
+
+    future = loop.create_future()
+    _inflight[key] = future
+
+    try:
+        result = await coro_factory()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Nobody else may be waiting; mark the exception as retrieved
+        future.exception()
+        raise
+    else:
+        if cache_if is None or cache_if(result):
+            _results[key] = (time.monotonic() + EXEC_CACHE_TTL, result)
+            _results.move_to_end(key)
+            while len(_results) > EXEC_CACHE_MAX_ENTRIES:
+                _results.popitem(last=False)
+        future.set_result(result)
+        return result
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
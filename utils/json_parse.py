@@ -0,0 +1,72 @@
+"""
+Lenient parsing of JSON objects from free-form LLM responses.
+
+`parse_llm_json` tries, in order:
+1. The whole response (orjson fast path)
+2. The body of a ```json fenced block
+3. The first balanced {...} object in the text, found with a string-aware
+   brace scanner, so nesting depth is not limited the way a regex is
+"""
+
+import re
+from typing import Any, Optional
+
+import orjson
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
+
+def _first_object(text: str) -> Optional[str]:
+    """Return the first balanced top-level {...} substring, or None."""
+    start = text.find("{")
+    while start != -1:
+        depth = 0
+        in_string = False
+        escape = False
+        for i in range(start, len(text)):
+            c = text[i]
+            if in_string:
+                if escape:
+                    escape = False
+                elif c == "\\":
+                    escape = True
+                elif c == '"':
+                    in_string = False
+            elif c == '"':
+                in_string = True
+            elif c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start:i + 1]
+        start = text.find("{", start + 1)
+    return None
+
+
+def parse_llm_json(raw: str) -> Any:
+    """
+    Parse the JSON object in an LLM response.
+
+    Raises:
+        ValueError: If no parseable JSON object is found
+    """
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        pass
+
+    candidates = []
+    fence = _FENCE_RE.search(raw)
+    if fence:
+        candidates.append(fence.group(1))
+    obj = _first_object(raw)
+    if obj is not None:
+        candidates.append(obj)
+
+    for candidate in candidates:
+        try:
+            return orjson.loads(candidate)
+        except orjson.JSONDecodeError:
+            continue
+    raise ValueError(f"No JSON object found in response: {raw[:200]}")
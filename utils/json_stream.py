@@ -0,0 +1,99 @@
+"""
+Incremental scanner for a JSON object arriving in chunks (e.g. a streamed LLM response).
+
+Only the top level of the object is tracked. The scanner reports each top-level
+field once its value is complete, and each element of a top-level array as soon
+as that element closes - so the first plan step can be acted on while the model
+is still generating the rest of the plan.
+
+    scanner = JsonObjectScanner()
+    for chunk in chunks:
+        for kind, key, value in scanner.feed(chunk):
+            ...  # kind is "item" (array element) or "field" (complete value)
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+Event = Tuple[str, str, Any]
+
+
+class JsonObjectScanner:
+    """Brace-depth tracker emitting ("item", key, value) and ("field", key, value) events."""
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._key: Optional[str] = None
+        self._after_colon = False
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Event]:
+        """Append a chunk and return the events it completed, in order."""
+        self.buffer += chunk
+        events: List[Event] = []
+        buf = self.buffer
+
+        for i in range(self._pos, len(buf)):
+            c = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._stack == ["{"] and self._value_start is None:
+                        self._key = json.loads(buf[self._string_start:i + 1])
+                continue
+
+            if c.isspace():
+                continue
+
+            depth = len(self._stack)
+
+            # Start of a top-level value or of an element of a top-level array
+            if depth == 1 and self._after_colon:
+                self._after_colon = False
+                self._value_start = i
+            elif depth == 2 and self._stack[1] == "[" and self._item_start is None and c not in ",]":
+                self._item_start = i
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c == ":" and depth == 1:
+                self._after_colon = True
+            elif c in "{[":
+                self._stack.append(c)
+            elif c in "}]":
+                if depth == 2 and self._item_start is not None:
+                    # Closing a top-level array with a scalar element still pending
+                    events.append(self._emit_item(buf[self._item_start:i]))
+                self._stack.pop()
+                if len(self._stack) == 2 and self._stack[1] == "[" and self._item_start is not None:
+                    events.append(self._emit_item(buf[self._item_start:i + 1]))
+                elif not self._stack and self._value_start is not None:
+                    events.append(self._emit_field(buf[self._value_start:i]))
+            elif c == ",":
+                if depth == 1 and self._value_start is not None:
+                    events.append(self._emit_field(buf[self._value_start:i]))
+                elif depth == 2 and self._stack[1] == "[" and self._item_start is not None:
+                    events.append(self._emit_item(buf[self._item_start:i]))
+
+        self._pos = len(buf)
+        return events
+
+    def _emit_item(self, text: str) -> Event:
+        self._item_start = None
+        return ("item", self._key, json.loads(text))
+
+    def _emit_field(self, text: str) -> Event:
+        self._value_start = None
+        return ("field", self._key, json.loads(text))
@@ -0,0 +1,206 @@
+"""
+Response cache for chat completion calls.
+
+Exact hits are keyed by a SHA-256 of (model, messages, temperature, extra
+request options), so only byte-identical requests match. An optional
+SemanticIndex additionally returns the stored response for a near-duplicate
+input (e.g. a draft that barely changed between runs).
+
+Backends implement the small CacheBackend protocol; memory and JSONL-file
+backends are provided. Both hold at most `max_entries` responses, evicting the
+oldest; the file backend skips expired lines on load and rewrites the file
+once it is mostly stale.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple
+
+from openai import AsyncOpenAI
+
+from utils.semantic_cache import SemanticIndex
+
+# Default lifetime of a cached response, in seconds
+LLM_CACHE_TTL = 3600
+# Default bound on cached responses per backend
+LLM_CACHE_MAX_ENTRIES = 1000
+
+
+def cache_key(model: str, messages: list, temperature: float, **options) -> str:
+    """Hash a chat completion request into a cache key."""
+    payload = {"model": model, "messages": messages, "temp": temperature, **options}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+async def stream_chat(client: AsyncOpenAI, on_chunk: Callable[[str], None], **request) -> str:
+    """Stream a chat completion, passing each content delta to `on_chunk`, and return the full content."""
+    stream = await client.chat.completions.create(stream=True, **request)
+    parts = []
+    async for chunk in stream:
+        if not chunk.choices or not chunk.choices[0].delta.content:
+            continue
+        delta = chunk.choices[0].delta.content
+        parts.append(delta)
+        on_chunk(delta)
+    return "".join(parts)
+
+
+class CacheBackend(Protocol):
+    """Storage used by LLMCache. Values must be JSON-serializable."""
+
+    async def get(self, key: str) -> Optional[Any]:
+        ...
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ...
+
+
+class MemoryBackend:
+    """Process-local dict backend, evicting the oldest entry beyond `max_entries`."""
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # Insertion-ordered, so the first key is the oldest
+        self._entries: Dict[str, Tuple[Optional[float], Any]] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and time.time() > expires_at:
+            del self._entries[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (time.time() + ttl if ttl else None, value)
+        self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+
+class FileBackend(MemoryBackend):
+    """
+    Memory backend that also appends every entry to a JSONL file and reloads it on start.
+
+    The file is append-only while running; it is rewritten with just the live
+    entries when more than half of its lines are expired, overridden or evicted.
+    """
+
+    def __init__(self, path: str = ".cache/llm_cache.jsonl", max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+        self.path = path
+        self._lines = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(path):
+            now = time.time()
+            with open(path) as f:
+                for line in f:
+                    self._lines += 1
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry["expires_at"] is not None and now > entry["expires_at"]:
+                        continue
+                    # Later lines win, so re-setting a key overrides it
+                    self._entries.pop(entry["key"], None)
+                    self._entries[entry["key"]] = (entry["expires_at"], entry["value"])
+            self._evict()
+            self._maybe_compact()
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await super().set(key, value, ttl)
+        expires_at, _ = self._entries[key]
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"key": key, "expires_at": expires_at, "value": value}) + "\n")
+        self._lines += 1
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        """Rewrite the file with only the live entries once most of its lines are stale."""
+        if self._lines <= 2 * max(len(self._entries), 1):
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for key, (expires_at, value) in self._entries.items():
+                f.write(json.dumps({"key": key, "expires_at": expires_at, "value": value}) + "\n")
+        os.replace(tmp_path, self.path)
+        self._lines = len(self._entries)
+
+
+class LLMCache:
+    """Exact + optional semantic cache around `client.chat.completions.create`."""
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        semantic: Optional[SemanticIndex] = None,
+        ttl: float = LLM_CACHE_TTL
+    ):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.semantic = semantic
+        self.ttl = ttl
+
+    async def chat(
+        self,
+        client: AsyncOpenAI,
+        *,
+        model: str,
+        messages: list,
+        temperature: float,
+        semantic_text: Optional[str] = None,
+        label: str = "[LLM Cache]",
+        on_chunk: Optional[Callable[[str], None]] = None,
+        **options
+    ) -> str:
+        """
+        Return the message content for a chat completion, from cache when possible.
+
+        Args:
+            client: OpenAI client used on a miss (and for embeddings)
+            model, messages, temperature: Passed to chat.completions.create
+            semantic_text: Text to match semantically (e.g. the content being
+                critiqued); semantic lookup is skipped when None
+            label: Prefix for hit messages
+            on_chunk: On a miss, stream the response and pass each content delta
+                to this callback (not called for cache hits)
+            **options: Extra request options (e.g. response_format); part of the key
+
+        Returns:
+            str: The assistant message content
+        """
+        key = cache_key(model, messages, temperature, **options)
+        cached = await self.backend.get(key)
+        if cached is not None:
+            print(f"{label} Exact hit")
+            return cached
+
+        embedding = None
+        if self.semantic is not None and semantic_text:
+            embedding = await self.semantic.embed(client, semantic_text)
+            match = self.semantic.search(embedding)
+            if match is not None:
+                print(f"{label} Semantic hit (similarity {match[0]:.3f})")
+                return match[1]
+
+        if on_chunk is not None:
+            content = await stream_chat(
+                client, on_chunk, model=model, messages=messages, temperature=temperature, **options
+            )
+        else:
+            response = await client.chat.completions.create(
+                model=model, messages=messages, temperature=temperature, **options
+            )
+            content = response.choices[0].message.content
+
+        await self.backend.set(key, content, ttl=self.ttl)
+        if embedding is not None:
+            self.semantic.add(embedding, content)
+        return content
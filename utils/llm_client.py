@@ -0,0 +1,51 @@
+"""
+Shared OpenAI client.
+
+Creating an `AsyncOpenAI` per call also creates a fresh `httpx.AsyncClient`,
+so the first request of every workflow run pays for a new TCP + TLS handshake.
+`get_openai_client()` hands out one client per event loop (and base URL)
+instead, backed by an HTTP/2 connection pool, so keep-alive connections are
+reused across iterations and concurrent calls are multiplexed over the same
+connection.
+"""
+
+import asyncio
+import weakref
+from typing import Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from config import OPENAI_API_KEY
+
+# Connection pool sizing for the shared HTTP client
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+# httpx connections are bound to the loop that opened them, so keep clients per loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Optional[str], AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_openai_client(base_url: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client for the running event loop.
+
+    Must be called from inside a task (not at import time) so the API key
+    injected by Flyte secrets is available.
+
+    Args:
+        base_url: OpenAI-compatible endpoint (e.g. a local vLLM server); None
+            uses the SDK default
+    """
+    loop = asyncio.get_running_loop()
+    loop_clients = _clients.setdefault(loop, {})
+    client = loop_clients.get(base_url)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            base_url=base_url,
+            http_client=httpx.AsyncClient(http2=True, limits=HTTP_LIMITS),
+        )
+        loop_clients[base_url] = client
+    return client
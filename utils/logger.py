@@ -1,14 +1,190 @@
+import asyncio
+import atexit
 import json
+import threading
 from datetime import datetime
 
+import orjson
+
+# Flush a batch after this many records or this many seconds, whichever comes first
+MAX_BATCH_SIZE = 256
+FLUSH_INTERVAL = 0.05
+# Bound on buffered records; log() waits for the writer once this is reached
+MAX_QUEUE_SIZE = 10000
+
+
+def _serialize(record) -> bytes:
+    """Encode one record as a JSONL line, degrading instead of raising on odd values."""
+    try:
+        return orjson.dumps(record, default=str, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    except (TypeError, orjson.JSONEncodeError):
+        pass
+    # Values orjson rejects outright, e.g. integers wider than 64 bits
+    try:
+        return json.dumps(record, default=str).encode() + b"\n"
+    except (TypeError, ValueError):
+        return orjson.dumps({"unserializable_record": repr(record)}) + b"\n"
+
+
 class Logger:
+    """
+    JSONL trace logger with batched background writes.
+
+    `log()` only enqueues the record; a single background task per event loop
+    collects records for up to FLUSH_INTERVAL seconds and appends them with one
+    write in a worker thread. Call `flush()` to wait until everything logged so
+    far is on disk. Anything still queued at interpreter exit is written by an
+    atexit hook.
+    """
+
     def __init__(self, path="agent_trace_log.jsonl", verbose=False):
         self.path = path
         self.verbose = verbose
+        self._fh = None
+        self._write_lock = threading.Lock()
+        self._queue = None
+        self._loop = None
+        self._flusher = None
+        # Background puts from log_nowait() on a full queue, kept referenced until done
+        self._pending_puts = set()
+        atexit.register(self._flush_sync)
 
     async def log(self, **kwargs):
         kwargs["timestamp"] = datetime.utcnow().isoformat()
         if self.verbose:
             print("[LOG]", kwargs)
-        with open(self.path, "a") as f:
-            f.write(json.dumps(kwargs) + "\n")
\ No newline at end of file
+        queue = self._ensure_flusher()
+        try:
+            queue.put_nowait(kwargs)
+        except asyncio.QueueFull:
+            await queue.put(kwargs)
+
+    async def log_batch(self, records):
+        """
+        Log several records at once (e.g. one per parallel task, collected after a phase).
+
+        All records share one timestamp and are handed to the writer together, so
+        they normally land in a single write.
+        """
+        timestamp = datetime.utcnow().isoformat()
+        queue = self._ensure_flusher()
+        for record in records:
+            record = {**record, "timestamp": timestamp}
+            if self.verbose:
+                print("[LOG]", record)
+            try:
+                queue.put_nowait(record)
+            except asyncio.QueueFull:
+                await queue.put(record)
+
+    def log_nowait(self, **kwargs):
+        """
+        Fire-and-forget variant of `log()` for hot loops; never blocks the caller.
+
+        Must be called from a running event loop. If the queue is full, the record
+        is handed to a background put instead of applying backpressure; `flush()`
+        waits for those puts too.
+        """
+        kwargs["timestamp"] = datetime.utcnow().isoformat()
+        if self.verbose:
+            print("[LOG]", kwargs)
+        queue = self._ensure_flusher()
+        try:
+            queue.put_nowait(kwargs)
+        except asyncio.QueueFull:
+            task = self._loop.create_task(queue.put(kwargs))
+            self._pending_puts.add(task)
+            task.add_done_callback(self._pending_puts.discard)
+
+    async def flush(self):
+        """Wait until every record logged on this event loop has been written."""
+        loop = asyncio.get_running_loop()
+        if self._queue is not None and self._loop is loop:
+            while pending := [task for task in self._pending_puts if task.get_loop() is loop]:
+                await asyncio.gather(*pending)
+            await self._queue.join()
+
+    async def close(self):
+        """Flush pending records, stop the background writer and close the file."""
+        await self.flush()
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        self._flush_sync()
+        with self._write_lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def _ensure_flusher(self) -> asyncio.Queue:
+        """Return the queue for the running loop, starting its writer task if needed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._flusher is None or self._flusher.done():
+            old_queue = self._queue
+            self._queue = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
+            self._loop = loop
+            # Carry over records left behind by a previous (possibly closed) loop
+            while old_queue is not None and not old_queue.empty():
+                self._queue.put_nowait(old_queue.get_nowait())
+            self._flusher = loop.create_task(self._drain(self._queue))
+        return self._queue
+
+    async def _drain(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch.append(await queue.get())
+                deadline = loop.time() + FLUSH_INTERVAL
+                while len(batch) < MAX_BATCH_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                try:
+                    await loop.run_in_executor(None, self._write, batch)
+                except Exception as e:
+                    # Drop the batch rather than the writer; flush() must not hang
+                    print(f"[Logger] Failed to write {len(batch)} record(s) to {self.path}: {e}")
+                finally:
+                    for _ in batch:
+                        queue.task_done()
+                    batch = []
+        except asyncio.CancelledError:
+            # Loop shutdown: write what was already dequeued before stopping
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    print(f"[Logger] Failed to write {len(batch)} record(s) to {self.path}: {e}")
+                finally:
+                    for _ in batch:
+                        queue.task_done()
+            raise
+
+    def _write(self, records):
+        lines = [_serialize(record) for record in records]
+        with self._write_lock:
+            if self._fh is None:
+                self._fh = open(self.path, "ab")
+            self._fh.writelines(lines)
+            self._fh.flush()
+
+    def _flush_sync(self):
+        """Synchronously write anything still queued (used at exit and on close)."""
+        if self._queue is None:
+            return
+        records = []
+        while not self._queue.empty():
+            records.append(self._queue.get_nowait())
+            self._queue.task_done()
+        if records:
+            self._write(records)
@@ -0,0 +1,148 @@
+"""
+Agentic plan cache: reuse planner output for recurring request patterns.
+
+Requests are fingerprinted by their content keywords, so "Calculate 5 factorial"
+and "calculate 7 factorial" share a cached plan. On a hit the planner LLM call is
+skipped; if the request wording differs, a cheap model rewrites only the step tasks.
+
+PlanStore is the shared fingerprint -> entry JSONL store; PlanCache here and
+PlanTemplateLibrary (utils/plan_templates.py) only differ in what they put.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+from utils.llm_client import get_openai_client
+
+# Configuration
+ADAPTER_CONFIG = {
+    "model": "gpt-4o-mini",  # Only rewrites task strings, so the small model is enough
+    "temperature": 0.0,
+    "max_tokens": 800,
+}
+
+# Words that carry no routing information
+STOP_WORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "by",
+    "is", "are", "was", "be", "it", "this", "that", "these", "those", "what",
+    "whats", "how", "me", "my", "please", "can", "you", "i", "from", "at", "as",
+    "then", "also", "do", "does", "give", "tell", "find", "get",
+}
+
+
+def plan_fingerprint(user_request: str) -> str:
+    """
+    Build a keyword fingerprint for a request.
+
+    Lowercases the text, keeps alphabetic words that are not stop words, and joins
+    the sorted unique set. Numbers and word order do not affect the fingerprint.
+
+    Args:
+        user_request: The raw user request
+
+    Returns:
+        str: Fingerprint string (empty if the request has no content words)
+    """
+    words = re.findall(r"[a-z]+", user_request.lower())
+    return " ".join(sorted({w for w in words if w not in STOP_WORDS}))
+
+
+class PlanStore:
+    """On-disk JSONL store mapping request fingerprints to plan entries."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, dict] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                # Later lines win, so re-putting a fingerprint overrides it
+                self._entries[entry["fingerprint"]] = entry
+
+    def get(self, fingerprint: str) -> Optional[dict]:
+        """Return the entry stored for a fingerprint, or None."""
+        if not fingerprint:
+            return None
+        return self._entries.get(fingerprint)
+
+    def _put(self, entry: dict):
+        """Store an entry (must include "fingerprint") in memory and append it to the file."""
+        self._entries[entry["fingerprint"]] = entry
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+class PlanCache(PlanStore):
+    """Planner steps keyed by request fingerprint; entries are {"request", "steps"}."""
+
+    def __init__(self, path: str = "plan_cache.jsonl"):
+        super().__init__(path)
+
+    def put(self, fingerprint: str, user_request: str, steps: List[dict]):
+        """Store the plan steps (agent, task, dependencies dicts) for a fingerprint."""
+        if not fingerprint:
+            return
+        self._put({"fingerprint": fingerprint, "request": user_request, "steps": steps})
+
+
+async def adapt_plan_steps(cached_request: str, steps: List[dict], user_request: str) -> Optional[List[dict]]:
+    """
+    Rewrite the task of each cached step for a new request.
+
+    Agents and dependencies are kept exactly as cached; only the task strings
+    change (e.g. different numbers or entities). Returns None if the adaptation
+    call fails or returns the wrong shape: the cached tasks belong to another
+    request and must not be run as-is.
+
+    Args:
+        cached_request: The request the plan was originally created for
+        steps: Cached steps as dicts with agent, task and dependencies
+        user_request: The new request to adapt the plan to
+
+    Returns:
+        list: Steps with adapted task strings, or None if adaptation failed
+    """
+    client = get_openai_client()
+
+    system_msg = """You adapt an existing execution plan to a new, similar request.
+
+You receive the original request, the new request, and a JSON array of task strings.
+Rewrite each task so it fits the new request (update numbers, names, places, etc.).
+Keep the same number of tasks in the same order.
+
+Respond with ONLY a JSON array of strings, no markdown, no explanation."""
+
+    user_msg = (
+        f"Original request: {cached_request}\n"
+        f"New request: {user_request}\n"
+        f"Tasks: {json.dumps([s['task'] for s in steps])}"
+    )
+
+    try:
+        response = await client.chat.completions.create(
+            model=ADAPTER_CONFIG["model"],
+            temperature=ADAPTER_CONFIG["temperature"],
+            max_tokens=ADAPTER_CONFIG["max_tokens"],
+            messages=[
+                {"role": "system", "content": system_msg},
+                {"role": "user", "content": user_msg}
+            ]
+        )
+        tasks = json.loads(response.choices[0].message.content)
+        if not isinstance(tasks, list) or len(tasks) != len(steps):
+            raise ValueError(f"expected {len(steps)} tasks, got {tasks!r}")
+    except Exception as e:
+        print(f"[Plan Cache] Adaptation failed: {e}")
+        return None
+
+    return [{**step, "task": str(task)} for step, task in zip(steps, tasks)]
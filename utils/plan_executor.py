@@ -1,4 +1,5 @@
 import json
+import re
 import asyncio
 from utils.logger import Logger
 from utils.decorators import agent_tools, tool_registry
@@ -6,6 +7,13 @@ from utils.decorators import agent_tools, tool_registry
 logger = Logger()
 
 
+def _substitute_previous(arg, last_result):
+    """Replace "previous" with the last tool result, also inside dict args (e.g. calc's vars)."""
+    if isinstance(arg, dict):
+        return {key: _substitute_previous(value, last_result) for key, value in arg.items()}
+    return last_result if str(arg).lower() == "previous" else arg
+
+
 def parse_plan_from_response(raw_plan: str) -> list:
     """
     Parse a tool execution plan from LLM response.
@@ -25,8 +33,6 @@ def parse_plan_from_response(raw_plan: str) -> list:
         return json.loads(raw_plan)
     except json.JSONDecodeError as e:
         # If that fails, try to extract JSON from markdown code blocks or surrounding text
-        import re
-
         print(f"[WARN] Direct JSON parse failed: {e}")
         print(f"[WARN] Attempting to extract JSON from response...")
 
@@ -83,7 +89,7 @@ async def execute_tool_plan(plan: list, agent: str) -> dict:
             tool_name = step["tool"]
             args = step["args"]
             reasoning = step.get("reasoning", "")
-            args = [last_result if str(a).lower() == "previous" else a for a in args]
+            args = [_substitute_previous(a, last_result) for a in args]
 
             if tool_name in toolset:
                 # Tools are now async, so we need to await them
@@ -0,0 +1,128 @@
+"""
+Plan template library for the hybrid workflow.
+
+After a goal is achieved, the successful steps of every iteration are flattened
+into one plan whose task strings have their entities (numbers, quoted text, proper
+nouns) replaced by placeholders. Templates are indexed by the same keyword
+fingerprint as the plan cache. For a new goal with a matching template, one
+small-model call fills the placeholders and the whole plan runs as the first
+iteration, instead of discovering it over several planner calls.
+"""
+
+import json
+import re
+from typing import Dict, List, Optional
+
+from utils.llm_client import get_openai_client
+from utils.plan_cache import ADAPTER_CONFIG, PlanStore
+
+# Entity patterns, applied in order (quoted text first so its contents are not re-redacted)
+_QUOTED_RE = re.compile(r"'[^']*'|\"[^\"]*\"")
+_NUMBER_RE = re.compile(r"-?\d+(?:[.,]\d+)*(?:[eE][+-]?\d+)?")
+# Capitalized words that do not start the task (names, places); acronyms like GDP are kept
+_PROPER_NOUN_RE = re.compile(r"(?<=\S )[A-Z][a-z][\w-]*(?: [A-Z][a-z][\w-]*)*")
+
+
+def redact_entities(task: str) -> str:
+    """
+    Replace the entities in a task string with placeholders.
+
+    Example: "Search for the GDP of Japan in 2023" -> "Search for the GDP of {ENTITY} in {NUMBER}"
+    """
+    task = _QUOTED_RE.sub("{TEXT}", task)
+    task = _NUMBER_RE.sub("{NUMBER}", task)
+    return _PROPER_NOUN_RE.sub("{ENTITY}", task)
+
+
+def flatten_iterations(iterations: List) -> List[dict]:
+    """
+    Merge the successful plan steps of all iterations into a single plan.
+
+    Steps whose result has an error are dropped, so failed attempts and
+    iterations that only hit errors are not replayed. Dependencies are
+    remapped to the kept steps' new indices, and dependencies on dropped steps
+    are removed. Only the dependencies the planner declared are kept.
+
+    Args:
+        iterations: HybridIteration records (`plan_steps` and `step_results` are read)
+
+    Returns:
+        list: Step dicts with agent, task and dependencies
+    """
+    steps: List[dict] = []
+    for iteration in iterations:
+        # Index in this iteration's plan -> index in the flattened plan
+        kept: Dict[int, int] = {}
+        for i, result in enumerate(iteration.step_results):
+            if not result.error:
+                kept[i] = len(steps) + len(kept)
+        for i, step in enumerate(iteration.plan_steps):
+            if i in kept:
+                dependencies = [kept[dep] for dep in step.dependencies if dep in kept]
+                steps.append({"agent": step.agent, "task": step.task, "dependencies": dependencies})
+    return steps
+
+
+class PlanTemplateLibrary(PlanStore):
+    """Redacted plan templates keyed by goal fingerprint; entries are {"goal", "steps"}."""
+
+    def __init__(self, path: str = "plan_templates.jsonl"):
+        super().__init__(path)
+
+    def put(self, fingerprint: str, goal: str, steps: List[dict]):
+        """Redact the task strings of a successful plan and store it as a template."""
+        if not fingerprint or not steps:
+            return
+        template = [{**step, "task": redact_entities(step["task"])} for step in steps]
+        self._put({"fingerprint": fingerprint, "goal": goal, "steps": template})
+
+
+async def fill_template(template: dict, goal: str) -> Optional[List[dict]]:
+    """
+    Fill the placeholders of a template for a new goal with one small-model call.
+
+    Agents and dependencies are kept as stored; only task strings change.
+
+    Args:
+        template: Entry returned by PlanTemplateLibrary.get
+        goal: The new goal
+
+    Returns:
+        list: Step dicts ready to run, or None if filling failed
+    """
+    steps = template["steps"]
+    client = get_openai_client()
+
+    system_msg = """You fill in a plan template for a new goal.
+
+You receive the goal the template came from, the new goal, and a JSON array of task
+strings containing placeholders such as {NUMBER}, {TEXT} and {ENTITY}.
+Replace every placeholder with the right value for the new goal.
+Keep the same number of tasks in the same order.
+
+Respond with ONLY a JSON array of strings, no markdown, no explanation."""
+
+    user_msg = (
+        f"Template goal: {template['goal']}\n"
+        f"New goal: {goal}\n"
+        f"Tasks: {json.dumps([s['task'] for s in steps])}"
+    )
+
+    try:
+        response = await client.chat.completions.create(
+            model=ADAPTER_CONFIG["model"],
+            temperature=ADAPTER_CONFIG["temperature"],
+            max_tokens=ADAPTER_CONFIG["max_tokens"],
+            messages=[
+                {"role": "system", "content": system_msg},
+                {"role": "user", "content": user_msg}
+            ]
+        )
+        tasks = json.loads(response.choices[0].message.content)
+        if not isinstance(tasks, list) or len(tasks) != len(steps):
+            raise ValueError(f"expected {len(steps)} tasks, got {tasks!r}")
+    except Exception as e:
+        print(f"[Plan Templates] Filling template failed: {e}")
+        return None
+
+    return [{**step, "task": str(task)} for step, task in zip(steps, tasks)]
@@ -0,0 +1,38 @@
+"""
+Response cache: identical requests return the previous workflow result.
+
+This sits above the plan cache. A hit skips the planner, the agents and every
+LLM call. Keys are a hash of the normalized request text, and entries expire
+after a TTL so answers that depend on live data (weather, web search) refresh.
+Entries are kept in an llm_cache backend (the JSONL FileBackend by default),
+so they get the same size bound and compaction as cached LLM responses.
+"""
+
+import hashlib
+from typing import Optional
+
+from utils.llm_cache import CacheBackend, FileBackend
+
+# Default lifetime of a cached response, in seconds
+RESPONSE_TTL = 3600
+
+
+def response_key(user_request: str) -> str:
+    """Hash a request (case- and surrounding-whitespace-insensitive) into a cache key."""
+    return hashlib.blake2b(user_request.strip().lower().encode(), digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """Store mapping request keys to result dicts with a TTL."""
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: float = RESPONSE_TTL):
+        self.backend = backend or FileBackend(path=".cache/responses.jsonl")
+        self.ttl = ttl
+
+    async def get(self, user_request: str) -> Optional[dict]:
+        """Return the cached result dict for a request, or None if missing or expired."""
+        return await self.backend.get(response_key(user_request))
+
+    async def put(self, user_request: str, value: dict):
+        """Store a result dict (e.g. dataclasses.asdict of the workflow result)."""
+        await self.backend.set(response_key(user_request), value, ttl=self.ttl)
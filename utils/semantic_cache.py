@@ -0,0 +1,180 @@
+"""
+Embedding-based nearest-neighbour lookup for caching LLM work on similar inputs.
+
+Texts are embedded with `text-embedding-3-small` and L2-normalized when added,
+so a lookup is a single matrix-vector product over a stacked float32 matrix
+followed by a top-k selection. When numba is installed the product runs as a
+parallel, fastmath-compiled kernel; otherwise numpy's BLAS matmul is used.
+Entries can optionally be persisted to a JSONL file (embeddings stored as
+base64-encoded float32 bytes) and given a time-to-live, after which they are
+ignored and dropped. Like llm_cache.FileBackend, the file is rewritten with
+just the live entries once most of its lines are stale.
+"""
+
+import base64
+import json
+import os
+import time
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+from openai import AsyncOpenAI
+
+try:
+    import numba
+except ImportError:  # Optional; cos_topk falls back to numpy
+    numba = None
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _cos_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        scores = np.empty(matrix.shape[0], dtype=np.float32)
+        for i in numba.prange(matrix.shape[0]):
+            acc = np.float32(0.0)
+            for j in range(matrix.shape[1]):
+                acc += matrix[i, j] * query[j]
+            scores[i] = acc
+        return scores
+else:
+    def _cos_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        return matrix @ query
+
+
+def cos_topk(query: np.ndarray, matrix: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the k rows of `matrix` most similar to `query`, best first.
+
+    Both must be L2-normalized float32, so the dot product is the cosine similarity.
+
+    Returns:
+        tuple: (row indices, similarities)
+    """
+    scores = _cos_scores(query, matrix)
+    k = min(k, scores.shape[0])
+    if k < scores.shape[0]:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(scores.shape[0])
+    top = top[np.argsort(-scores[top])]
+    return top, scores[top]
+
+
+class SemanticIndex:
+    """In-memory (optionally file-backed) index of normalized embeddings and their values."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        threshold: float = 0.97,
+        model: str = EMBEDDING_MODEL,
+        ttl: Optional[float] = None
+    ):
+        self.path = path
+        self.threshold = threshold
+        self.model = model
+        self.ttl = ttl  # Seconds an entry stays valid; None = forever
+        self._rows: List[np.ndarray] = []
+        self._values: List[Any] = []
+        self._expires: List[Optional[float]] = []
+        self._matrix: Optional[np.ndarray] = None  # Stacked rows, rebuilt lazily after adds
+        self._lines = 0  # Lines in the file, live or not
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            for line in f:
+                self._lines += 1
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                expires_at = entry.get("expires_at")
+                if expires_at is not None and time.time() > expires_at:
+                    continue
+                row = np.frombuffer(base64.b64decode(entry["embedding"]), dtype=np.float32)
+                self._rows.append(row)
+                self._values.append(entry["value"])
+                self._expires.append(expires_at)
+        self._maybe_compact()
+
+    @staticmethod
+    def _entry_line(embedding: np.ndarray, value: Any, expires_at: Optional[float]) -> str:
+        entry = {
+            "embedding": base64.b64encode(embedding.tobytes()).decode("ascii"),
+            "value": value,
+            "expires_at": expires_at
+        }
+        return json.dumps(entry) + "\n"
+
+    def _maybe_compact(self):
+        """Rewrite the file with only the live entries once most of its lines are stale."""
+        if not self.path or self._lines <= 2 * max(len(self._rows), 1):
+            return
+        self._prune()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for row, value, expires_at in zip(self._rows, self._values, self._expires):
+                f.write(self._entry_line(row, value, expires_at))
+        os.replace(tmp_path, self.path)
+        self._lines = len(self._rows)
+
+    def _prune(self):
+        """Drop expired entries from memory."""
+        now = time.time()
+        keep = [i for i, expires_at in enumerate(self._expires) if expires_at is None or now <= expires_at]
+        if len(keep) == len(self._rows):
+            return
+        self._rows = [self._rows[i] for i in keep]
+        self._values = [self._values[i] for i in keep]
+        self._expires = [self._expires[i] for i in keep]
+        self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    async def embed(self, client: AsyncOpenAI, text: str) -> np.ndarray:
+        """Embed a text and return it as an L2-normalized float32 vector."""
+        response = await client.embeddings.create(model=self.model, input=text)
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def search(self, embedding: np.ndarray) -> Optional[Tuple[float, Any]]:
+        """
+        Find the most similar stored entry.
+
+        Returns:
+            tuple: (cosine similarity, value) if the best match reaches the
+                threshold, otherwise None
+        """
+        self._prune()
+        if not self._rows:
+            return None
+        if self._matrix is None:
+            self._matrix = np.ascontiguousarray(np.vstack(self._rows))
+        top, scores = cos_topk(np.asarray(embedding, dtype=np.float32), self._matrix, 1)
+        if scores[0] < self.threshold:
+            return None
+        return float(scores[0]), self._values[int(top[0])]
+
+    def add(self, embedding: np.ndarray, value: Any):
+        """Store a normalized embedding with its (JSON-serializable) value."""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        expires_at = time.time() + self.ttl if self.ttl else None
+        self._rows.append(embedding)
+        self._values.append(value)
+        self._expires.append(expires_at)
+        self._matrix = None
+        if self.path:
+            with open(self.path, "a") as f:
+                f.write(self._entry_line(embedding, value, expires_at))
+            self._lines += 1
+            self._prune()
+            self._maybe_compact()
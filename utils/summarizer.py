@@ -2,6 +2,7 @@
 Smart context summarization utility using LLM when needed.
 """
 
+import re
 from openai import AsyncOpenAI
 from config import OPENAI_API_KEY
 
@@ -15,6 +16,10 @@ SUMMARIZER_CONFIG = {
 # Thresholds
 MIN_LENGTH_TO_SUMMARIZE = 800  # Only summarize if longer than this
 TARGET_SUMMARY_LENGTH = 500    # Aim for summaries around this length
+RULE_SUMMARY_LENGTH = 300      # Budget for deterministic (no LLM) summaries
+
+# Matches "key: value" / "'key': value" pairs in dict-like tool output
+_KEY_VALUE_RE = re.compile(r"""['"]?(\w+)['"]?\s*:\s*([^,\n{}\[\]]+)""")
 
 
 async def smart_summarize(text: str, context: str = "general") -> str:
@@ -129,4 +134,37 @@ def _fallback_summarize(text: str, max_chars: int = TARGET_SUMMARY_LENGTH) -> st
     if last_space > max_chars * 0.8:  # Only use if we're not losing too much
         return truncated[:last_space] + "..."
 
-    return truncated + "..."
\ No newline at end of file
+    return truncated + "..."
+
+
+def rule_summarize(text: str, max_chars: int = RULE_SUMMARY_LENGTH) -> str:
+    """
+    Deterministic summary for passing results between agents - no LLM call.
+
+    Short text is returned with whitespace collapsed. Longer dict-like output
+    (e.g. weather data) is reduced to its key=value pairs; anything else is
+    truncated at a sentence boundary.
+
+    Args:
+        text: Text to summarize
+        max_chars: Maximum character length
+
+    Returns:
+        Compact summary of the text
+    """
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+
+    pairs = _KEY_VALUE_RE.findall(text)
+    if pairs:
+        # Keep the first value seen for each key
+        fields = {}
+        for key, value in pairs:
+            fields.setdefault(key, value.strip(" '\""))
+        key_values = ", ".join(f"{key}={value}" for key, value in fields.items())
+        if len(key_values) <= max_chars:
+            return key_values
+
+    return _fallback_summarize(text, max_chars)
+
@@ -0,0 +1,43 @@
+"""
+Compact, reversible line deltas between successive versions of a text.
+
+A delta is a JSON array of operations applied in order to the previous text:
+`[i, j]` copies lines i..j-1 of the previous version and a string inserts new
+text. Unchanged regions cost a few bytes regardless of their length, so a
+revision that rewrites one paragraph of a long draft stores only that paragraph.
+
+    delta = diff_text(old, new)
+    assert apply_diff(old, delta) == new
+"""
+
+import difflib
+from typing import List, Union
+
+import orjson
+
+
+def diff_text(previous: str, current: str) -> str:
+    """Encode `current` as a delta against `previous`."""
+    old_lines = previous.splitlines(keepends=True)
+    new_lines = current.splitlines(keepends=True)
+    ops: List[Union[List[int], str]] = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(new_lines[j1:j2]))
+        # "delete" needs no op: the lines are simply not copied
+    return orjson.dumps(ops).decode()
+
+
+def apply_diff(previous: str, delta: str) -> str:
+    """Rebuild the text a delta was computed for from the previous version."""
+    old_lines = previous.splitlines(keepends=True)
+    parts = []
+    for op in orjson.loads(delta):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(old_lines[op[0]:op[1]])
+    return "".join(parts)
@@ -21,6 +21,7 @@ from dataclasses import dataclass
 import flyte
 import asyncio
 import json
+import re
 
 # Add project root to Python path
 project_root = Path(__file__).parent
@@ -39,6 +40,11 @@ from openai import AsyncOpenAI
 # Initialize logger
 logger = Logger(path="react_trace_log.jsonl", verbose=False)
 
+# Fallbacks for decisions that are not bare JSON: a fenced ```json block, then any
+# object with at most one level of nesting
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+_JSON_BRACE_RE = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', re.DOTALL)
+
 # ----------------------------------
 # Data Models
 # ----------------------------------
@@ -169,13 +175,12 @@ IMPORTANT:
             decision = json.loads(raw_response)
         except json.JSONDecodeError:
             # If that fails, try to extract JSON from markdown code blocks
-            import re
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', raw_response, re.DOTALL)
+            json_match = _JSON_FENCE_RE.search(raw_response)
             if json_match:
                 decision = json.loads(json_match.group(1))
             else:
                 # Try to find any JSON object in the response
-                json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', raw_response, re.DOTALL)
+                json_match = _JSON_BRACE_RE.search(raw_response)
                 if json_match:
                     decision = json.loads(json_match.group(0))
                 else:
@@ -21,46 +21,158 @@ Usage:
 
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, Dict, List, Optional
 from dataclasses import dataclass, field
 import flyte
 import asyncio
 import json
+import re
+import orjson
 
 # Add project root to Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 # Import agents and planner types
-from agents.math_agent import math_agent
-from agents.string_agent import string_agent
-from agents.web_search_agent import web_search_agent
-from agents.code_agent import code_agent
-from agents.weather_agent import weather_agent
+from agents import AGENTS, SUMMARY_ATTRS, agent_slot
 from agents.planner_agent import AgentStep
-from config import base_env, OPENAI_API_KEY
+from config import base_env, PLANNER_MODEL, REFLECTION_MODEL, PLANNER_BASE_URL
 from utils.logger import Logger
+from utils.exec_cache import memoize
+from utils.dag_scheduler import build_dependency_graph, run_dag
+from utils.summarizer import rule_summarize
+from utils.llm_client import get_openai_client
+from utils.json_stream import JsonObjectScanner
+from utils.plan_cache import plan_fingerprint
+from utils.plan_templates import PlanTemplateLibrary, fill_template, flatten_iterations
 from openai import AsyncOpenAI
 
 # Initialize logger
 logger = Logger(path="react_planner_trace_log.jsonl", verbose=False)
 
+# Redacted plans from achieved goals, keyed by goal keywords
+plan_templates = PlanTemplateLibrary(path="plan_templates.jsonl")
+
+# Patterns used by summarize_iteration
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s")
+
+# Final line of a reflection, see REFLECTION_SYSTEM_PROMPT
+_VERDICT_RE = re.compile(r"Verdict:\s*(DONE|CONTINUE)", re.IGNORECASE)
+
+# ----------------------------------
+# Prompts
+# ----------------------------------
+# These are module constants and never contain per-run data (goal, history,
+# results), so every call sends an identical prefix that OpenAI's automatic
+# prompt caching can reuse across iterations and runs.
+
+AVAILABLE_AGENTS = ["math", "string", "web_search", "code", "weather"]
+
+HYBRID_SYSTEM_PROMPT = f"""You are a hybrid ReAct + Planner agent.
+
+Available agents:
+{chr(10).join([f"- {agent}" for agent in AVAILABLE_AGENTS])}
+
+The user message contains the goal and a summary of previous iterations.
+
+Your task: Think about what to do next, then create a MINI-PLAN.
+
+Respond in JSON format:
+{{
+  "thought": "Your reasoning about the current state and what's needed",
+  "goal_achieved": false,
+  "plan_steps": [
+    {{"agent": "agent_name", "task": "specific task", "dependencies": []}},
+    {{"agent": "agent_name", "task": "another task", "dependencies": []}}
+  ],
+  "final_answer": null
+}}
+
+OR if the goal is achieved:
+{{
+  "thought": "Why the goal is now achieved",
+  "goal_achieved": true,
+  "plan_steps": [],
+  "final_answer": "The complete answer to the user's goal"
+}}
+
+MINI-PLAN RULES:
+- Include 1-5 steps maximum per iteration
+- Steps with empty dependencies [] run in PARALLEL
+- Use dependencies: [0] to make step 1 wait for step 0
+- Be strategic: group independent tasks to leverage parallelism
+- You can do more steps in the NEXT iteration if needed
+
+IMPORTANT:
+- Think step-by-step about the current state
+- Only set goal_achieved=true when you have the final answer
+- Use dependencies wisely to enable parallelism
+"""
+
+# JSON schema for the planner response (OpenAI structured outputs, strict mode:
+# every property is required and no extra properties are allowed)
+HYBRID_DECISION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "thought": {"type": "string"},
+        "goal_achieved": {"type": "boolean"},
+        "plan_steps": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "agent": {"type": "string", "enum": AVAILABLE_AGENTS},
+                    "task": {"type": "string"},
+                    "dependencies": {"type": "array", "items": {"type": "integer"}}
+                },
+                "required": ["agent", "task", "dependencies"],
+                "additionalProperties": False
+            }
+        },
+        "final_answer": {"type": ["string", "null"]}
+    },
+    "required": ["thought", "goal_achieved", "plan_steps", "final_answer"],
+    "additionalProperties": False
+}
+
+REFLECTION_SYSTEM_PROMPT = """Reflect on the results of one iteration of a multi-agent workflow.
+The user message contains the goal, the reasoning behind the iteration, and the results.
+
+Provide a brief reflection (2-3 sentences):
+1. What did we learn from these results?
+2. Are we closer to the goal?
+3. What should we do next (or are we done)?
+
+End with a final line that is exactly "Verdict: DONE" if the results already
+answer the goal, or "Verdict: CONTINUE" otherwise."""
+
 # ----------------------------------
 # Data Models
 # ----------------------------------
 
-@dataclass
+@dataclass(slots=True)
+class StepResult:
+    """Outcome of one mini-plan step"""
+    agent: str
+    task: str                         # Original task (without dependency context)
+    observation: str                  # Agent output passed to reflection
+    summary_line: str = ""            # Compact line passed to dependent steps
+    error: str = ""                   # Empty if the step succeeded
+
+
+@dataclass(slots=True)
 class HybridIteration:
     """Single iteration of the hybrid workflow"""
     iteration_number: int
     thought: str                      # Reasoning about what to do
     plan_steps: List[AgentStep]       # Mini-plan for this iteration
-    step_results: List[Dict]          # Results from each step
+    step_results: List[StepResult]    # Results from each step
     reflection: str                   # Analysis of all results
     goal_achieved: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class HybridResult:
     """Final result from hybrid workflow"""
     goal: str
@@ -100,107 +212,56 @@ async def hybrid_workflow(user_goal: str, max_iterations: int = 10) -> HybridRes
     print(f"HYBRID ReAct + Planner WORKFLOW - Goal: {user_goal}")
     print("=" * 80)
 
-    # Initialize OpenAI client
-    client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    # Shared client: keeps its connection pool warm across iterations and runs.
+    # Planner and reflection calls may target a separate server (PLANNER_BASE_URL).
+    client = get_openai_client(PLANNER_BASE_URL)
 
     # Track execution state
     iterations: List[HybridIteration] = []
     context_history = []
     goal_achieved = False
     total_steps_executed = 0
-
-    available_agents = ["math", "string", "web_search", "code", "weather"]
+    next_decision = None
+    # Steps of the drafted next plan that started while it was streaming
+    next_early_tasks: Dict[int, asyncio.Task] = {}
+
+    # A recurring kind of goal: run the whole known plan as the first iteration
+    fingerprint = plan_fingerprint(user_goal)
+    template = plan_templates.get(fingerprint)
+    if template:
+        print(f"\n[Hybrid] Plan template hit for '{fingerprint}', filling it in...")
+        filled_steps = await fill_template(template, user_goal)
+        if filled_steps:
+            next_decision = {
+                "thought": f"Reusing the plan template from a similar goal: {template['goal']}",
+                "goal_achieved": False,
+                "plan_steps": filled_steps,
+                "final_answer": None
+            }
 
     for iter_num in range(1, max_iterations + 1):
         print(f"\n{'='*80}")
         print(f"ITERATION {iter_num}")
         print(f"{'='*80}")
 
-        # Build context from previous iterations
-        if context_history:
-            history_text = "\n\n".join([
-                f"Iteration {h['iteration']}:\n"
-                f"Thought: {h['thought']}\n"
-                f"Executed {len(h['plan_steps'])} step(s)\n"
-                f"Results: {h['summary']}\n"
-                f"Reflection: {h['reflection']}"
-                for h in context_history[-2:]  # Last 2 iterations
-            ])
+        if next_decision is not None:
+            # Drafted while the previous reflection was running (or filled from a template)
+            print("\n[Hybrid] Using plan drafted during reflection...")
+            decision, next_decision = next_decision, None
+            early_tasks, next_early_tasks = next_early_tasks, {}
         else:
-            history_text = "No previous iterations."
-
-        # Ask agent to reason and create a mini-plan
-        system_msg = f"""You are a hybrid ReAct + Planner agent.
-
-Goal: {user_goal}
-
-Available agents:
-{chr(10).join([f"- {agent}" for agent in available_agents])}
-
-Previous iterations:
-{history_text}
-
-Your task: Think about what to do next, then create a MINI-PLAN.
-
-Respond in JSON format:
-{{
-  "thought": "Your reasoning about the current state and what's needed",
-  "goal_achieved": false,
-  "plan_steps": [
-    {{"agent": "agent_name", "task": "specific task", "dependencies": []}},
-    {{"agent": "agent_name", "task": "another task", "dependencies": []}}
-  ],
-  "final_answer": null
-}}
-
-OR if the goal is achieved:
-{{
-  "thought": "Why the goal is now achieved",
-  "goal_achieved": true,
-  "plan_steps": [],
-  "final_answer": "The complete answer to the user's goal"
-}}
-
-MINI-PLAN RULES:
-- Include 1-5 steps maximum per iteration
-- Steps with empty dependencies [] run in PARALLEL
-- Use dependencies: [0] to make step 1 wait for step 0
-- Be strategic: group independent tasks to leverage parallelism
-- You can do more steps in the NEXT iteration if needed
-
-IMPORTANT:
-- Think step-by-step about the current state
-- Only set goal_achieved=true when you have the final answer
-- Use dependencies wisely to enable parallelism
-"""
-
-        print("\n[Hybrid] Reasoning and planning...")
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            temperature=0.3,
-            messages=[
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": f"Goal: {user_goal}\n\nWhat should we do in this iteration?"}
-            ]
-        )
-
-        # Parse decision with robust JSON extraction
-        raw_response = response.choices[0].message.content
-
-        try:
-            decision = json.loads(raw_response)
-        except json.JSONDecodeError:
-            import re
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', raw_response, re.DOTALL)
-            if json_match:
-                decision = json.loads(json_match.group(1))
-            else:
-                json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', raw_response, re.DOTALL)
-                if json_match:
-                    decision = json.loads(json_match.group(0))
-                else:
-                    print(f"[ERROR] Could not parse JSON from response: {raw_response}")
-                    raise ValueError(f"LLM did not return valid JSON. Response: {raw_response[:200]}")
+            # Dependency-free steps started while the plan was still streaming
+            early_tasks: Dict[int, asyncio.Task] = {}
+            print("\n[Hybrid] Reasoning and planning...")
+            try:
+                decision = await plan_iteration(
+                    client, user_goal, format_history(context_history),
+                    on_ready_step=early_starter(early_tasks)
+                )
+            except BaseException:
+                for task in early_tasks.values():
+                    task.cancel()
+                raise
 
         thought = decision["thought"]
         goal_achieved = decision["goal_achieved"]
@@ -209,7 +270,10 @@ IMPORTANT:
 
         # Check if goal is achieved
         if goal_achieved:
-            final_answer = decision["final_answer"]
+            for task in early_tasks.values():
+                task.cancel()
+            # The schema allows a null final_answer; fall back to the thought
+            final_answer = str(decision["final_answer"] or thought)
             print(f"\n✅ Goal achieved!")
             print(f"📝 Final answer: {final_answer}")
 
@@ -236,68 +300,115 @@ IMPORTANT:
 
         print(f"\n📋 Mini-plan: {len(plan_steps)} step(s)")
         for i, step in enumerate(plan_steps):
-            deps_str = f" (depends on: {step.dependencies})" if step.dependencies else " (parallel)"
+            deps_str = f" (depends on: {list(step.dependencies)})" if step.dependencies else " (parallel)"
             print(f"  Step {i}: {step.agent} - {step.task}{deps_str}")
 
+        # Build the dependency graph once; the scheduler consumes it directly
+        graph = build_dependency_graph(plan_steps)
+
         # Execute the mini-plan with dependency-aware parallelism
         print(f"\n🚀 Executing mini-plan...")
-        step_results = await execute_mini_plan(plan_steps)
+        step_results = await execute_mini_plan(plan_steps, graph, started=early_tasks)
         total_steps_executed += len(plan_steps)
 
         # Show results
         print(f"\n📊 Results:")
         for i, result in enumerate(step_results):
-            print(f"  Step {i}: {result['observation'][:100]}{'...' if len(result['observation']) > 100 else ''}")
+            print(f"  Step {i}: {result.observation[:100]}{'...' if len(result.observation) > 100 else ''}")
 
         # Reflect on ALL results
         results_summary = "\n".join([
-            f"Step {i} ({r['agent']}): {r['observation']}"
+            f"Step {i} ({r.agent}): {r.observation}"
             for i, r in enumerate(step_results)
         ])
 
-        reflection_prompt = f"""Reflect on the results of this iteration:
-
-Goal: {user_goal}
+        reflection_prompt = f"""Goal: {user_goal}
 Thought: {thought}
 Steps executed: {len(step_results)}
 
 Results:
-{results_summary}
+{results_summary}"""
 
-Provide a brief reflection (2-3 sentences):
-1. What did we learn from these results?
-2. Are we closer to the goal?
-3. What should we do next (or are we done)?"""
-
-        reflection_response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            temperature=0.3,
-            max_tokens=200,
-            messages=[
-                {"role": "user", "content": reflection_prompt}
-            ]
-        )
-
-        reflection = reflection_response.choices[0].message.content.strip()
-        print(f"\n🤔 Reflection: {reflection}")
-
-        # Record this iteration
         iteration_record = HybridIteration(
             iteration_number=iter_num,
             thought=thought,
             plan_steps=plan_steps,
             step_results=step_results,
-            reflection=reflection,
+            reflection="",
             goal_achieved=False
         )
+        summary = summarize_iteration(iteration_record)
+
+        # A single successful step speaks for itself; only ask the LLM to reflect
+        # when several results need weighing or the lone step failed
+        needs_reflection = len(step_results) != 1 or bool(step_results[0].error)
+        if not needs_reflection:
+            observation = " ".join(step_results[0].observation.split())
+            reflection = f"Got: {observation[:120]}. Proceeding."
+
+        pending = []
+        if needs_reflection:
+            pending.append(client.chat.completions.create(
+                model=REFLECTION_MODEL,
+                temperature=0.3,
+                max_tokens=200,  # 2-3 sentences plus the verdict line, with room to spare
+                messages=[
+                    {"role": "system", "content": REFLECTION_SYSTEM_PROMPT},
+                    {"role": "user", "content": reflection_prompt}
+                ]
+            ))
+        if iter_num < max_iterations:
+            # Reflection only feeds the next planner call as history, so draft the
+            # next plan while it is generated, starting its dependency-free steps as
+            # they stream in. The draft sees the results but not the reflection text;
+            # it is dropped (and its started steps cancelled) unless it goes the way
+            # of the verdict: more steps on CONTINUE, a final answer on DONE. Advice
+            # in a CONTINUE reflection therefore reaches the planner one iteration late.
+            speculative_history = format_history(context_history + [{
+                "iteration": iter_num,
+                "thought": thought,
+                "summary": summary,
+                "reflection": "(pending)" if needs_reflection else reflection
+            }])
+            pending.append(plan_iteration(
+                client, user_goal, speculative_history, on_ready_step=early_starter(next_early_tasks)
+            ))
+
+        try:
+            responses = await asyncio.gather(*pending)
+        except BaseException:
+            for task in next_early_tasks.values():
+                task.cancel()
+            raise
+
+        if needs_reflection:
+            reflection_response, *drafted = responses
+            reflection = reflection_response.choices[0].message.content.strip()
+        else:
+            drafted = responses
+        print(f"\n🤔 Reflection: {reflection}")
+
+        if drafted:
+            next_decision = drafted[0]
+            if needs_reflection:
+                verdict = _VERDICT_RE.search(reflection)
+                done = verdict is not None and verdict.group(1).upper() == "DONE"
+                if verdict is None or next_decision["goal_achieved"] != done:
+                    print("[Hybrid] Drafted plan disagrees with the reflection's verdict, replanning")
+                    for task in next_early_tasks.values():
+                        task.cancel()
+                    next_early_tasks = {}
+                    next_decision = None
+
+        # Record this iteration
+        iteration_record.reflection = reflection
         iterations.append(iteration_record)
 
-        # Add to context history
+        # Add a compact summary to context history (full steps live in `iterations`)
         context_history.append({
             "iteration": iter_num,
             "thought": thought,
-            "plan_steps": plan_steps,
-            "summary": results_summary[:300],
+            "summary": summary,
             "reflection": reflection
         })
 
@@ -310,6 +421,10 @@ Provide a brief reflection (2-3 sentences):
             reflection=reflection
         )
 
+    # Store new templates, and replace one that still needed follow-up iterations
+    if goal_achieved and (not template or len(iterations) > 1):
+        plan_templates.put(fingerprint, user_goal, flatten_iterations(iterations))
+
     # If we exited the loop without achieving goal
     if not goal_achieved:
         print(f"\n⚠️  Reached maximum iterations ({max_iterations}) without achieving goal")
@@ -321,6 +436,9 @@ Provide a brief reflection (2-3 sentences):
     print(f"Total steps executed: {total_steps_executed}")
     print(f"{'='*80}")
 
+    # Trace records are written in the background; make sure they hit disk
+    await logger.flush()
+
     return HybridResult(
         goal=user_goal,
         iterations=iterations,
@@ -331,83 +449,214 @@ Provide a brief reflection (2-3 sentences):
     )
 
 
-async def execute_mini_plan(plan_steps: List[AgentStep]) -> List[Dict]:
+def format_history(context_history: List[Dict]) -> str:
+    """Render the last two context_history entries for the planner prompt."""
+    if not context_history:
+        return "No previous iterations."
+    return "\n\n".join([
+        f"Iteration {h['iteration']}:\n"
+        f"Thought: {h['thought']}\n"
+        f"Results: {h['summary']}\n"
+        f"Reflection: {h['reflection']}"
+        for h in context_history[-2:]  # Last 2 iterations
+    ])
+
+
+async def plan_iteration(
+    client: AsyncOpenAI,
+    user_goal: str,
+    history_text: str,
+    on_ready_step: Optional[Callable[[int, AgentStep], None]] = None
+) -> Dict:
     """
-    Execute a mini-plan with dependency-aware parallel execution.
+    Ask the planner for the next thought and mini-plan.
 
-    This is similar to the dynamic workflow's orchestrator but simplified
-    for a single iteration of the hybrid workflow.
+    The response is streamed. With `on_ready_step`, each plan step without
+    dependencies is passed to the callback as soon as its JSON object closes,
+    before the rest of the plan has been generated.
+
+    Returns:
+        dict: Decision matching HYBRID_DECISION_SCHEMA
+    """
+    stream = await client.chat.completions.create(
+        model=PLANNER_MODEL,
+        temperature=0.3,
+        stream=True,
+        response_format={
+            "type": "json_schema",
+            "json_schema": {"name": "HybridDecision", "schema": HYBRID_DECISION_SCHEMA, "strict": True}
+        },
+        messages=[
+            # Static prefix first so the provider's prompt cache can reuse it
+            {"role": "system", "content": HYBRID_SYSTEM_PROMPT},
+            {"role": "user", "content": (
+                f"Goal: {user_goal}\n\n"
+                f"Previous iterations:\n{history_text}\n\n"
+                "What should we do in this iteration?"
+            )}
+        ]
+    )
+
+    scanner = JsonObjectScanner()
+    step_idx = 0
+    refusal = []
+    finish_reason = None
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        finish_reason = choice.finish_reason or finish_reason
+        if getattr(choice.delta, "refusal", None):
+            refusal.append(choice.delta.refusal)
+        if not choice.delta.content:
+            continue
+        for kind, key, value in scanner.feed(choice.delta.content):
+            if kind != "item" or key != "plan_steps":
+                continue
+            if on_ready_step is not None and not value["dependencies"]:
+                on_ready_step(step_idx, AgentStep(agent=value["agent"], task=value["task"]))
+            step_idx += 1
+
+    # Structured outputs guarantee the schema only for a complete, non-refused response
+    if refusal:
+        return planner_error_decision(f"planner refused: {''.join(refusal)}")
+    if finish_reason == "length":
+        return planner_error_decision("planner response was truncated")
+    try:
+        return orjson.loads(scanner.buffer)
+    except orjson.JSONDecodeError as e:
+        return planner_error_decision(f"planner returned invalid JSON: {e}")
+
+
+def planner_error_decision(reason: str) -> Dict:
     """
-    completed_results: Dict[int, Dict] = {}
-    pending_steps = list(enumerate(plan_steps))
+    Decision used when the planner gives no usable plan: no steps, goal not achieved.
 
-    while pending_steps:
-        # Find steps that can execute now (dependencies satisfied)
-        ready_steps = []
-        remaining_steps = []
+    The empty iteration is reflected on and the next iteration plans again.
+    """
+    print(f"[Hybrid] No usable plan ({reason})")
+    return {
+        "thought": f"Planning failed: {reason}",
+        "goal_achieved": False,
+        "plan_steps": [],
+        "final_answer": None
+    }
 
-        for step_idx, step in pending_steps:
-            deps_satisfied = all(dep_idx in completed_results for dep_idx in step.dependencies)
 
-            if deps_satisfied:
-                ready_steps.append((step_idx, step))
-            else:
-                remaining_steps.append((step_idx, step))
+def summarize_iteration(iteration: HybridIteration) -> str:
+    """
+    Build a compact, deterministic summary of an iteration for the next prompt.
 
-        if not ready_steps:
-            print("[ERROR] No steps ready but pending steps remain (circular dependency?)")
-            break
+    Numeric agents (math, weather) keep only the first number in their
+    observation, string/code keep their first sentence, and web search is
+    truncated to 120 characters.
+    """
+    key_outputs = {}
+    for i, result in enumerate(iteration.step_results):
+        observation = " ".join(str(result.observation).split())
+        if result.agent in ("math", "weather"):
+            match = _NUMBER_RE.search(observation)
+            key_outputs[f"step{i}"] = match.group(0) if match else observation[:120]
+        elif result.agent in ("string", "code"):
+            key_outputs[f"step{i}"] = _SENTENCE_END_RE.split(observation, maxsplit=1)[0]
+        else:
+            key_outputs[f"step{i}"] = observation[:120]
+
+    return json.dumps({
+        "iter": iteration.iteration_number,
+        "agents": [result.agent for result in iteration.step_results],
+        "key_outputs": key_outputs
+    })
+
+
+def early_starter(tasks: Dict[int, asyncio.Task]) -> Callable[[int, AgentStep], None]:
+    """Return an on_ready_step callback that launches each streamed step into `tasks`."""
+    def start_early(step_idx: int, step: AgentStep):
+        print(f"[Hybrid] Step {step_idx} streamed in, starting {step.agent} early")
+        tasks[step_idx] = asyncio.create_task(run_agent_step(step_idx, step, {}))
+    return start_early
+
+
+async def run_agent_step(step_idx: int, step: AgentStep, completed_results: Dict[int, StepResult]) -> StepResult:
+    """Run one mini-plan step, prefixing its task with the results of its dependencies."""
+    # If this step has dependencies, augment task with results (invalid indices are skipped)
+    task = step.task
+    if step.dependencies:
+        task = "Context:\n" + "\n".join(
+            completed_results[dep_idx].summary_line
+            for dep_idx in step.dependencies if dep_idx in completed_results
+        ) + f"\n\nYour task: {task}"
+
+    # Route to appropriate agent
+    agent_fn = AGENTS.get(step.agent)
+    error = ""
+    if agent_fn is None:
+        observation = f"ERROR: Unknown agent '{step.agent}'"
+        error = f"Unknown agent: {step.agent}"
+    else:
+        async def call_agent():
+            # Bounded concurrency: global cap plus per-agent caps (see agents/__init__.py)
+            async with agent_slot(step.agent):
+                return await agent_fn(task)
+
+        # Re-planned sub-tasks from earlier iterations are served from cache
+        result = await memoize(step.agent, task, call_agent, cache_if=lambda r: not r.error)
+        observation = getattr(result, SUMMARY_ATTRS.get(step.agent, "final_result"), "") or result.final_result
+        error = result.error
+
+    return StepResult(
+        agent=step.agent,
+        task=step.task,
+        observation=observation,
+        # Pass a compact rule-based summary downstream, not the full output
+        summary_line=f"Result from step {step_idx}: {rule_summarize(observation)}",
+        error=error
+    )
 
-        print(f"  Executing {len(ready_steps)} step(s) in parallel...")
-
-        # Execute ready steps in parallel
-        async def execute_step(step_idx: int, step: AgentStep) -> tuple:
-            # If this step has dependencies, augment task with results
-            task = step.task
-            if step.dependencies:
-                dep_results = []
-                for dep_idx in step.dependencies:
-                    dep_result = completed_results[dep_idx]
-                    dep_results.append(f"Result from step {dep_idx}: {dep_result['observation']}")
-                task = f"Context:\n" + "\n".join(dep_results) + f"\n\nYour task: {task}"
-
-            # Route to appropriate agent
-            if step.agent == "math":
-                result = await math_agent(task)
-                observation = result.final_result
-            elif step.agent == "string":
-                result = await string_agent(task)
-                observation = result.final_result
-            elif step.agent == "web_search":
-                result = await web_search_agent(task)
-                observation = getattr(result, 'summary', result.final_result)
-            elif step.agent == "code":
-                result = await code_agent(task)
-                observation = result.final_result
-            elif step.agent == "weather":
-                result = await weather_agent(task)
-                observation = result.final_result
-            else:
-                observation = f"ERROR: Unknown agent '{step.agent}'"
-
-            return step_idx, {
-                "agent": step.agent,
-                "task": step.task,
-                "observation": observation
-            }
 
-        # Execute in parallel
-        results = await asyncio.gather(*[execute_step(idx, step) for idx, step in ready_steps])
+async def execute_mini_plan(
+    plan_steps: List[AgentStep],
+    graph=None,
+    started: Optional[Dict[int, asyncio.Task]] = None
+) -> List[StepResult]:
+    """
+    Execute a mini-plan with dependency-aware parallel execution.
 
-        # Store completed results
-        for step_idx, result in results:
-            completed_results[step_idx] = result
+    This is similar to the dynamic workflow's orchestrator but simplified
+    for a single iteration of the hybrid workflow. `graph` is an optional
+    pre-built (indegree, children) pair from build_dependency_graph, and
+    `started` holds run_agent_step tasks already launched for dependency-free
+    steps while the plan was streaming.
+    """
+    completed_results: Dict[int, StepResult] = {}
 
-        # Update pending steps
-        pending_steps = remaining_steps
+    async def execute_step(step_idx: int, step: AgentStep) -> StepResult:
+        return await run_agent_step(step_idx, step, completed_results)
 
-    # Return results in original order
-    return [completed_results[i] for i in range(len(plan_steps))]
+    def skipped_step(step_idx: int, step: AgentStep, failed_idx: int) -> StepResult:
+        return StepResult(
+            agent=step.agent,
+            task=step.task,
+            observation=f"ERROR: Skipped - upstream error in step {failed_idx}",
+            error=f"Skipped: upstream error in step {failed_idx}"
+        )
+
+    # Run steps in dependency order; independent steps execute concurrently and
+    # steps downstream of a failed step are skipped without calling their agent
+    await run_dag(
+        plan_steps, execute_step, completed_results, label=" ", graph=graph, started=started,
+        is_error=lambda result: bool(result.error), make_skipped=skipped_step
+    )
+
+    # Return results in original order (steps that never became ready are reported as errors)
+    return [
+        completed_results.get(i) or StepResult(
+            agent=step.agent,
+            task=step.task,
+            observation="ERROR: Not executed - unresolved dependencies"
+        )
+        for i, step in enumerate(plan_steps)
+    ]
 
 
 # ----------------------------------
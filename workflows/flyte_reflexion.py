@@ -17,11 +17,13 @@ Usage:
 
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import flyte
 import asyncio
-import json
+import difflib
+import statistics
+import orjson
 
 # Add project root to Python path
 project_root = Path(__file__).parent
@@ -31,28 +33,200 @@ sys.path.insert(0, str(project_root))
 from agents.web_search_agent import web_search_agent
 from agents.writer_agent import writer_agent
 from agents.editor_agent import editor_agent
-from config import base_env, OPENAI_API_KEY
+from config import base_env, CRITIC_MODEL, CRITIC_ESCALATE_MODEL
+from utils.llm_client import get_openai_client
+from utils.console import ConsoleBuffer
 from utils.logger import Logger
+from utils.text_diff import apply_diff, diff_text
+from utils.json_stream import JsonObjectScanner
+from utils.llm_cache import LLMCache, FileBackend, LLM_CACHE_TTL, stream_chat
+from utils.semantic_cache import SemanticIndex
 from openai import AsyncOpenAI
 
 # Initialize logger
 logger = Logger(path="reflexion_trace_log.jsonl", verbose=False)
 
+# Cached web research is reused for a day, then searched again
+RESEARCH_CACHE_TTL = 24 * 3600
+
+# Critiques of identical requests (exact) or near-identical drafts (cosine >= 0.97).
+# Semantic hits are only used for initial drafts (see critique_content): a light
+# revision is as similar as that to its predecessor and would get its stale score.
+_critique_cache: Optional[LLMCache] = None
+
+
+def get_critique_cache() -> LLMCache:
+    """Return the critique response cache, loading it from disk on first call."""
+    global _critique_cache
+    if _critique_cache is None:
+        _critique_cache = LLMCache(
+            backend=FileBackend(path=".cache/critiques.jsonl"),
+            semantic=SemanticIndex(path=".cache/critique_embeddings.jsonl", threshold=0.97, ttl=LLM_CACHE_TTL)
+        )
+    return _critique_cache
+
+
+# Research summaries keyed by topic embedding; related topics (cosine >= 0.90) share research.
+# Created on first use so importing the module does not touch the filesystem.
+_research_cache: Optional[SemanticIndex] = None
+
+
+def get_research_cache() -> SemanticIndex:
+    """Return the research summary index, loading it from disk on first call."""
+    global _research_cache
+    if _research_cache is None:
+        _research_cache = SemanticIndex(path=".cache/research_cache.jsonl", threshold=0.90, ttl=RESEARCH_CACHE_TTL)
+    return _research_cache
+
+# JSON schema for critic responses (OpenAI structured outputs, strict mode)
+CRITIQUE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "overall_score": {"type": "number"},
+        "clarity_score": {"type": "number"},
+        "structure_score": {"type": "number"},
+        "engagement_score": {"type": "number"},
+        "completeness_score": {"type": "number"},
+        "accuracy_score": {"type": "number"},
+        "strengths": {"type": "array", "items": {"type": "string"}},
+        "weaknesses": {"type": "array", "items": {"type": "string"}},
+        "specific_improvements": {"type": "string"},
+        "meets_threshold": {"type": "boolean"}
+    },
+    "required": [
+        "overall_score", "clarity_score", "structure_score", "engagement_score",
+        "completeness_score", "accuracy_score", "strengths", "weaknesses",
+        "specific_improvements", "meets_threshold"
+    ],
+    "additionalProperties": False
+}
+
+# Static critic instructions, sent as the system message; the draft is the user message
+SYSTEM_CRITIC = """You are a content quality critic. The user message is the content to evaluate.
+
+Evaluate on these criteria (rate 0-10 for each):
+1. Clarity - Is it easy to understand?
+2. Structure - Is it well-organized?
+3. Engagement - Is it interesting to read?
+4. Completeness - Does it cover the topic well?
+5. Accuracy - Is the information correct?
+
+Respond in JSON format:
+{
+  "overall_score": 8.5,
+  "clarity_score": 9.0,
+  "structure_score": 8.0,
+  "engagement_score": 8.5,
+  "completeness_score": 8.0,
+  "accuracy_score": 9.0,
+  "strengths": ["Clear writing", "Good structure"],
+  "weaknesses": ["Could be more engaging", "Missing examples"],
+  "specific_improvements": "Add concrete examples. Use more vivid language in the introduction.",
+  "meets_threshold": true
+}
+"""
+
+# Critic instructions for re-scoring a revision from its diff instead of the full text
+SYSTEM_DELTA_CRITIC = """You are a content quality critic re-scoring a revised draft.
+
+The user message contains the critique of the previous version and a unified diff
+of the changes made since. For each previous weakness, decide whether the changes
+addressed it. Keep strengths the changes did not affect, list the weaknesses that
+remain (plus any the changes introduced), and re-score every criterion (0-10) for
+the revised version: clarity, structure, engagement, completeness, accuracy.
+
+Respond in the same JSON format as the previous critique.
+"""
+
+# Revisions that change more than this fraction of the lines get a full critique
+DELTA_CRITIQUE_MAX_CHANGE = 0.4
+
+# Critic perspectives used by the ensemble critique (--ensemble-critics)
+CRITIC_PERSONAS = ["strict editor", "casual reader", "domain expert"]
+
+# Numeric critique fields, aggregated by median across the ensemble
+CRITIQUE_SCORE_FIELDS = [
+    "overall_score", "clarity_score", "structure_score",
+    "engagement_score", "completeness_score", "accuracy_score",
+]
+
+# Critiques scoring within this distance of the threshold are re-scored by the escalation model
+CRITIC_ESCALATION_MARGIN = 0.5
+
+# Seconds between status checks while a Batch API job runs
+BATCH_POLL_INTERVAL = 30
+
+# Agent prompt templates. Fixed instructions come first and the variable text
+# (draft/research) last, so repeated calls share a prompt prefix the provider can cache.
+WRITING_TEMPLATE = """Write a blog post about: {topic}
+
+Requirements:
+- Engaging title
+- Well-structured with sections
+- 300-500 words
+- Clear and informative
+
+Research context:
+{research}
+"""
+
+SKELETON_TEMPLATE = """Write an outline-only blog skeleton about: {topic}
+
+Requirements:
+- Engaging title
+- Section headings with one or two placeholder sentences each
+- No facts or figures yet; they will be filled in from research
+"""
+
+FUSION_TEMPLATE = """Turn this blog skeleton into a finished blog post using the research below.
+
+Requirements:
+- Keep the title and section structure unless the research calls for changes
+- 300-500 words
+- Clear and informative
+
+Return ONLY the finished blog post.
+
+Research context:
+{research}
+
+Skeleton:
+{skeleton}"""
+
+REVISION_TEMPLATE = """Apply the suggested improvements in the critique to enhance the content below. Maintain the overall structure and key information, but address all weaknesses mentioned in the critique.
+Return ONLY the improved content.
+{variant}
+Critique:
+{critique}
+
+Content:
+{content}"""
+
+# Extra editor instructions that make revision candidates differ from each other.
+# Candidate i uses REVISION_VARIANTS[i % len(REVISION_VARIANTS)]; the first keeps
+# the plain revision prompt, so num_candidates=1 behaves like a single revision.
+REVISION_VARIANTS = [
+    "",
+    "Prioritize clarity: simplify sentences and tighten the wording.\n",
+    "Prioritize engagement: add concrete examples and a stronger introduction.\n",
+    "Prioritize completeness: fill gaps in coverage without padding.\n",
+]
+
 # ----------------------------------
 # Data Models
 # ----------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReflexionIteration:
     """Single iteration of the reflexion workflow"""
     iteration_number: int
-    content: str                # Current version of content
+    content_diff: str           # Full text on iteration 1, then a delta vs. the previous iteration
     critique: str               # Critique of this version
     quality_score: float        # 0-10 score
     improvements_made: str      # What was improved
     meets_threshold: bool = False
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReflexionResult:
     """Final result from reflexion workflow"""
     topic: str
@@ -64,6 +238,19 @@ class ReflexionResult:
     quality_threshold_met: bool
 
 
+def reconstruct_content(iterations: List[ReflexionIteration], n: int) -> str:
+    """
+    Rebuild the full content critiqued in iteration `n` (1-based).
+
+    Iteration 1 stores its content in full; later iterations store a
+    utils.text_diff delta against the iteration before, which are applied in order.
+    """
+    content = iterations[0].content_diff
+    for iteration in iterations[1:n]:
+        content = apply_diff(content, iteration.content_diff)
+    return content
+
+
 # ----------------------------------
 # Reflexion Workflow
 # ----------------------------------
@@ -74,7 +261,15 @@ env = base_env
 async def reflexion_workflow(
     topic: str,
     quality_threshold: float = 8.0,
-    max_iterations: int = 5
+    max_iterations: int = 5,
+    num_candidates: int = 1,
+    max_call_concurrency: int = 4,
+    strict_phases: bool = False,
+    use_cache: bool = True,
+    critic_model: str = CRITIC_MODEL,
+    critic_escalate_model: str = CRITIC_ESCALATE_MODEL,
+    full_critique_every: int = 3,
+    ensemble_critics: bool = False
 ) -> ReflexionResult:
     """
     Reflexion workflow that iteratively improves content through critique.
@@ -83,216 +278,342 @@ async def reflexion_workflow(
         topic: The topic to write about
         quality_threshold: Quality score (0-10) to aim for
         max_iterations: Maximum refinement iterations
+        num_candidates: Revision variants generated per iteration; all are
+            critiqued concurrently and the best-scoring one is kept
+        max_call_concurrency: Maximum concurrent critique/editor calls
+        strict_phases: Research first, then write the draft from it (serial).
+            By default research runs alongside a skeleton draft and an editor
+            pass fuses the two.
+        use_cache: Reuse cached critiques for identical or near-identical drafts,
+            and cached research for closely related topics
+        critic_model: Model for routine critiques
+        critic_escalate_model: Model that re-scores critiques within
+            CRITIC_ESCALATION_MARGIN of the threshold (empty to disable)
+        full_critique_every: Critique the full content every this many
+            iterations; in between, revisions are scored from their diff
+            against the previous draft (1 = always full)
+        ensemble_critics: Score each draft with every CRITIC_PERSONAS critic
+            concurrently and use the median
 
     Returns:
         ReflexionResult: Complete execution trace and final content
     """
-    print("=" * 80)
-    print(f"REFLEXION WORKFLOW - Topic: {topic}")
-    print(f"Quality Threshold: {quality_threshold}/10")
-    print("=" * 80)
+    out = ConsoleBuffer()
+    out.print("=" * 80)
+    out.print(f"REFLEXION WORKFLOW - Topic: {topic}")
+    out.print(f"Quality Threshold: {quality_threshold}/10")
+    out.print("=" * 80)
+    out.flush()
 
-    # Initialize OpenAI client
-    client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    research_summary, current_content = await research_and_draft(topic, strict_phases, use_cache)
 
-    # Track execution state
-    iterations: List[ReflexionIteration] = []
-    quality_threshold_met = False
+    return await refine_content(
+        topic=topic,
+        research_summary=research_summary,
+        current_content=current_content,
+        quality_threshold=quality_threshold,
+        max_iterations=max_iterations,
+        num_candidates=num_candidates,
+        max_call_concurrency=max_call_concurrency,
+        use_cache=use_cache,
+        critic_model=critic_model,
+        critic_escalate_model=critic_escalate_model,
+        full_critique_every=full_critique_every,
+        ensemble_critics=ensemble_critics
+    )
 
-    # ----------------------------------
-    # PHASE 1: Research
-    # ----------------------------------
-    print(f"\n{'='*80}")
-    print(f"PHASE 1: RESEARCH")
-    print(f"{'='*80}")
 
+async def research_and_draft(topic: str, strict_phases: bool = False, use_cache: bool = True) -> Tuple[str, str]:
+    """
+    Research a topic and write the initial draft (phases 1 and 2).
+
+    Returns:
+        tuple: (research_summary, draft content)
+    """
     research_task = f"Search for information about: {topic}"
-    print(f"\n📚 Researching: {topic}")
+    # Console output is buffered and written once per phase
+    out = ConsoleBuffer()
 
-    research_result = await web_search_agent(research_task)
-    research_summary = research_result.summary
+    if strict_phases:
+        # ----------------------------------
+        # PHASE 1: Research
+        # ----------------------------------
+        out.banner("PHASE 1: RESEARCH")
 
-    print(f"✅ Research complete: {len(research_summary)} characters")
-    print(f"Preview: {research_summary[:200]}...")
+        out.print(f"\n📚 Researching: {topic}")
+        out.flush()
 
-    # ----------------------------------
-    # PHASE 2: Initial Draft
-    # ----------------------------------
-    print(f"\n{'='*80}")
-    print(f"PHASE 2: INITIAL DRAFT")
-    print(f"{'='*80}")
+        research_summary = await research_topic(topic, research_task, use_cache)
 
-    writing_task = f"""Write a blog post about: {topic}
+        out.print(f"✅ Research complete: {len(research_summary)} characters")
+        out.print(f"Preview: {research_summary[:200]}...")
 
-Research context:
-{research_summary}
+        # ----------------------------------
+        # PHASE 2: Initial Draft
+        # ----------------------------------
+        out.banner("PHASE 2: INITIAL DRAFT")
 
-Requirements:
-- Engaging title
-- Well-structured with sections
-- 300-500 words
-- Clear and informative
-"""
+        writing_task = WRITING_TEMPLATE.format(topic=topic, research=research_summary)
 
-    print(f"\n✍️  Writing initial draft...")
-    draft_result = await writer_agent(writing_task)
-    current_content = draft_result.final_result
+        out.print(f"\n✍️  Writing initial draft...")
+        out.flush()
+        draft_result = await writer_agent(writing_task)
+        current_content = draft_result.final_result
+    else:
+        # ----------------------------------
+        # PHASE 1+2: Research and skeleton draft in parallel, then fuse
+        # ----------------------------------
+        out.banner("PHASE 1+2: RESEARCH + SKELETON DRAFT (parallel)")
+
+        skeleton_task = SKELETON_TEMPLATE.format(topic=topic)
+
+        out.print(f"\n📚 Researching and ✍️  drafting skeleton: {topic}")
+        out.flush()
+        research_summary, skeleton_result = await asyncio.gather(
+            research_topic(topic, research_task, use_cache),
+            writer_agent(skeleton_task)
+        )
 
-    print(f"✅ Draft complete: {len(current_content)} characters")
-    print(f"\nDraft preview:\n{current_content[:300]}...\n")
+        out.print(f"✅ Research complete: {len(research_summary)} characters")
+        out.print(f"Preview: {research_summary[:200]}...")
+        out.print(f"✅ Skeleton complete: {len(skeleton_result.final_result)} characters")
 
-    # ----------------------------------
-    # PHASE 3: Iterative Refinement
-    # ----------------------------------
-    print(f"\n{'='*80}")
-    print(f"PHASE 3: ITERATIVE REFINEMENT")
-    print(f"{'='*80}")
+        fusion_task = FUSION_TEMPLATE.format(research=research_summary, skeleton=skeleton_result.final_result)
 
-    for iter_num in range(1, max_iterations + 1):
-        print(f"\n{'='*80}")
-        print(f"ITERATION {iter_num}")
-        print(f"{'='*80}")
+        out.print(f"\n🧩 Fusing research into skeleton...")
+        out.flush()
+        draft_result = await editor_agent(fusion_task)
+        current_content = draft_result.final_result
 
-        # Critique the current content
-        critique_prompt = f"""You are a content quality critic. Evaluate this content:
+    out.print(f"✅ Draft complete: {len(current_content)} characters")
+    out.print(f"\nDraft preview:\n{current_content[:300]}...\n")
+    out.flush()
 
-{current_content}
+    return research_summary, current_content
 
-Evaluate on these criteria (rate 0-10 for each):
-1. Clarity - Is it easy to understand?
-2. Structure - Is it well-organized?
-3. Engagement - Is it interesting to read?
-4. Completeness - Does it cover the topic well?
-5. Accuracy - Is the information correct?
 
-Respond in JSON format:
-{{
-  "overall_score": 8.5,
-  "clarity_score": 9.0,
-  "structure_score": 8.0,
-  "engagement_score": 8.5,
-  "completeness_score": 8.0,
-  "accuracy_score": 9.0,
-  "strengths": ["Clear writing", "Good structure"],
-  "weaknesses": ["Could be more engaging", "Missing examples"],
-  "specific_improvements": "Add concrete examples. Use more vivid language in the introduction.",
-  "meets_threshold": true
-}}
-"""
+async def research_topic(topic: str, research_task: str, use_cache: bool = True) -> str:
+    """
+    Run the web search agent for a topic, reusing the research of a similar earlier topic.
 
-        print(f"\n🔍 Critiquing content...")
+    The topic is embedded and matched against the research cache; a match at or above
+    its threshold returns the stored summary without searching again.
 
-        critique_response = await client.chat.completions.create(
-            model="gpt-4o",
-            temperature=0.3,
-            messages=[
-                {"role": "user", "content": critique_prompt}
-            ]
-        )
+    Returns:
+        str: Research summary
+    """
+    if not use_cache:
+        research_result = await web_search_agent(research_task)
+        return research_result.summary
+
+    client = get_openai_client()
+    research_cache = get_research_cache()
+    embedding = await research_cache.embed(client, topic)
+    match = research_cache.search(embedding)
+    if match is not None:
+        score, cached = match
+        print(f"[Research Cache] Reusing research for '{cached['topic']}' (similarity {score:.3f})")
+        return cached["summary"]
 
-        # Parse critique with robust JSON extraction
-        raw_critique = critique_response.choices[0].message.content
+    research_result = await web_search_agent(research_task)
+    # Never cache a failed or empty search; it would be served for every similar topic
+    if not research_result.error and research_result.summary.strip():
+        research_cache.add(embedding, {"topic": topic, "summary": research_result.summary})
+    return research_result.summary
 
-        try:
-            critique_data = json.loads(raw_critique)
-        except json.JSONDecodeError:
-            import re
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', raw_critique, re.DOTALL)
-            if json_match:
-                critique_data = json.loads(json_match.group(1))
-            else:
-                json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', raw_critique, re.DOTALL)
-                if json_match:
-                    critique_data = json.loads(json_match.group(0))
-                else:
-                    print(f"[ERROR] Could not parse critique JSON: {raw_critique}")
-                    raise ValueError(f"LLM did not return valid JSON")
 
-        quality_score = critique_data["overall_score"]
-        strengths = critique_data.get("strengths", [])
-        weaknesses = critique_data.get("weaknesses", [])
-        specific_improvements = critique_data.get("specific_improvements", "")
+async def refine_content(
+    topic: str,
+    research_summary: str,
+    current_content: str,
+    quality_threshold: float = 8.0,
+    max_iterations: int = 5,
+    num_candidates: int = 1,
+    max_call_concurrency: int = 4,
+    use_cache: bool = True,
+    critic_model: str = CRITIC_MODEL,
+    critic_escalate_model: str = CRITIC_ESCALATE_MODEL,
+    full_critique_every: int = 3,
+    ensemble_critics: bool = False,
+    first_critique: Optional[Dict] = None
+) -> ReflexionResult:
+    """
+    Critique and revise a draft until it meets the threshold (phase 3).
+
+    Args:
+        first_critique: Critique of `current_content` obtained elsewhere (e.g. from
+            a Batch API run); used instead of critiquing it again in iteration 1
+        (remaining arguments as in reflexion_workflow)
+
+    Returns:
+        ReflexionResult: Complete execution trace and final content
+    """
+    # Shared per-loop OpenAI client (keeps the connection pool warm across calls)
+    client = get_openai_client()
+    # Caps concurrent critique/editor calls to stay within rate limits
+    semaphore = asyncio.Semaphore(max_call_concurrency)
+    # Console output is buffered and written once per phase
+    out = ConsoleBuffer()
 
-        print(f"\n📊 Quality Score: {quality_score}/10")
-        print(f"✅ Strengths: {', '.join(strengths)}")
-        print(f"⚠️  Weaknesses: {', '.join(weaknesses)}")
-        print(f"💡 Improvements: {specific_improvements}")
+    # Track execution state
+    iterations: List[ReflexionIteration] = []
+    previous_content = ""  # Content of the last recorded iteration, base for the next delta
+    quality_threshold_met = False
 
-        # Format critique for storage
-        critique_text = f"""Quality Score: {quality_score}/10
+    # ----------------------------------
+    # PHASE 3: Iterative Refinement
+    # ----------------------------------
+    out.banner("PHASE 3: ITERATIVE REFINEMENT")
 
-Strengths: {', '.join(strengths)}
-Weaknesses: {', '.join(weaknesses)}
+    # Current pool of drafts; each iteration keeps the best-scoring one
+    candidates = [current_content]
 
-Specific Improvements:
-{specific_improvements}"""
+    # Revision started from a partially streamed critique
+    early_revision: Optional[asyncio.Task] = None
 
-        # Check if threshold met
+    def is_borderline(critique: Dict) -> bool:
+        return bool(critic_escalate_model) and critic_escalate_model != critic_model and \
+            abs(critique["overall_score"] - quality_threshold) < CRITIC_ESCALATION_MARGIN
+
+    def start_revision(partial_critique: Dict):
+        nonlocal early_revision
+        if partial_critique["overall_score"] >= quality_threshold or is_borderline(partial_critique):
+            # Passing, or about to be re-scored by the escalation model
+            return
+        out.print("🔄 Improvements received, starting revision while the critique finishes...")
+        early_revision = asyncio.create_task(revise_content(
+            candidates[0], _format_critique(partial_critique), REVISION_VARIANTS[0], semaphore
+        ))
+
+    for iter_num in range(1, max_iterations + 1):
+        out.banner(f"ITERATION {iter_num}")
+
+        if iter_num == 1 and first_critique is not None:
+            # Critique of the initial draft was already obtained (e.g. via the Batch API)
+            critiques = [first_critique]
+        else:
+            # Critique every candidate concurrently. With a single candidate the
+            # critique is streamed and the revision starts once its improvements arrive.
+            stream_revision = num_candidates == 1 and iter_num < max_iterations and not ensemble_critics
+            # Revisions are re-scored from their diff, with a full critique every few iterations
+            full_critique = iter_num == 1 or full_critique_every <= 1 or (iter_num - 1) % full_critique_every == 0
+            previous = None if full_critique else (current_content, critique_data)
+            out.print(f"\n🔍 Critiquing {len(candidates)} candidate(s){'' if full_critique else ' (delta)'}...")
+            out.flush()
+            if ensemble_critics:
+                critiques = await asyncio.gather(*[
+                    ensemble_critique(client, candidate, semaphore, use_cache, model=critic_model, previous=previous)
+                    for candidate in candidates
+                ])
+            else:
+                critiques = await asyncio.gather(*[
+                    critique_content(
+                        client, candidate, semaphore, use_cache,
+                        on_improvements=start_revision if stream_revision else None,
+                        model=critic_model,
+                        previous=previous,
+                        initial_draft=iter_num == 1
+                    )
+                    for candidate in candidates
+                ])
+
+        # Re-score borderline critiques with the stronger model, keeping its verdict
+        borderline = [i for i, critique in enumerate(critiques) if is_borderline(critique)]
+        if borderline:
+            out.print(f"🔎 Borderline score(s), re-critiquing {len(borderline)} candidate(s) with {critic_escalate_model}...")
+            out.flush()
+            critic = ensemble_critique if ensemble_critics else critique_content
+            escalated = await asyncio.gather(*[
+                critic(client, candidates[i], semaphore, use_cache, model=critic_escalate_model)
+                for i in borderline
+            ])
+            critiques = list(critiques)
+            for i, critique in zip(borderline, escalated):
+                critiques[i] = critique
+
+        best_idx = max(range(len(candidates)), key=lambda i: critiques[i]["overall_score"])
+        current_content = candidates[best_idx]
+        critique_data = critiques[best_idx]
+        if len(candidates) > 1:
+            scores = ", ".join(str(c["overall_score"]) for c in critiques)
+            out.print(f"🏆 Candidate scores: {scores} -> keeping candidate {best_idx}")
+
+        quality_score = critique_data["overall_score"]
         meets_threshold = quality_score >= quality_threshold
 
-        # Record this iteration
-        iteration_record = ReflexionIteration(
+        out.print(f"\n📊 Quality Score: {quality_score}/10")
+        if meets_threshold:
+            out.print(f"\n✅ Quality threshold met! ({quality_score} >= {quality_threshold})")
+            quality_threshold_met = True
+        else:
+            out.print(f"✅ Strengths: {', '.join(critique_data['strengths'])}")
+            out.print(f"⚠️  Weaknesses: {', '.join(critique_data['weaknesses'])}")
+            out.print(f"💡 Improvements: {critique_data['specific_improvements']}")
+
+        # Format critique once for the record and the revision prompt
+        critique_text = _format_critique(critique_data)
+
+        # Record this iteration (as a delta against the previously recorded content)
+        iterations.append(ReflexionIteration(
             iteration_number=iter_num,
-            content=current_content,
+            content_diff=diff_text(previous_content, current_content) if iterations else current_content,
             critique=critique_text,
             quality_score=quality_score,
-            improvements_made=specific_improvements,
+            improvements_made=critique_data["specific_improvements"],
             meets_threshold=meets_threshold
-        )
-        iterations.append(iteration_record)
+        ))
+        previous_content = current_content
 
         # Log to file
-        await logger.log(
+        logger.log_nowait(
             iteration=iter_num,
             quality_score=quality_score,
-            strengths=strengths,
-            weaknesses=weaknesses,
-            improvements=specific_improvements
+            candidate_scores=[c["overall_score"] for c in critiques],
+            strengths=critique_data["strengths"],
+            weaknesses=critique_data["weaknesses"],
+            improvements=critique_data["specific_improvements"]
         )
 
-        # Check if we've met the threshold
         if meets_threshold:
-            print(f"\n✅ Quality threshold met! ({quality_score} >= {quality_threshold})")
-            quality_threshold_met = True
+            if early_revision is not None:
+                early_revision.cancel()
             break
 
-        # If not at max iterations, revise the content
+        # If not at max iterations, revise the best draft into a new candidate pool
         if iter_num < max_iterations:
-            print(f"\n🔄 Revising content based on critique...")
-
-            revision_task = f"""Review and improve this content:
-
-{current_content}
-
-Critique:
-{critique_text}
-
-Apply the suggested improvements to enhance the content. Maintain the overall structure and key information, but address all weaknesses mentioned in the critique.
-
-Return ONLY the improved content."""
+            if early_revision is None:
+                out.print(f"\n🔄 Revising content based on critique ({num_candidates} candidate(s))...")
+            out.flush()
+            if early_revision is not None:
+                candidates = [await early_revision]
+                early_revision = None
+            else:
+                candidates = list(await asyncio.gather(*[
+                    revise_content(current_content, critique_text, REVISION_VARIANTS[i % len(REVISION_VARIANTS)], semaphore)
+                    for i in range(num_candidates)
+                ]))
 
-            revision_result = await editor_agent(revision_task)
-            current_content = revision_result.final_result
+            out.print(f"✅ Revision complete: {', '.join(str(len(c)) for c in candidates)} characters")
 
-            print(f"✅ Revision complete: {len(current_content)} characters")
+    # Iteration records were queued without waiting; make sure they are written
+    await logger.flush()
 
     # If we exited the loop without meeting threshold
     if not quality_threshold_met:
-        print(f"\n⚠️  Reached maximum iterations ({max_iterations}) without meeting threshold")
-        print(f"Final score: {quality_score}/{quality_threshold}")
+        out.print(f"\n⚠️  Reached maximum iterations ({max_iterations}) without meeting threshold")
+        out.print(f"Final score: {quality_score}/{quality_threshold}")
 
-    print(f"\n{'='*80}")
-    print(f"WORKFLOW COMPLETE")
-    print(f"Iterations: {len(iterations)}")
-    print(f"Final Quality Score: {quality_score}/10")
-    print(f"Threshold Met: {quality_threshold_met}")
-    print(f"{'='*80}")
+    out.print(f"\n{'='*80}")
+    out.print(f"WORKFLOW COMPLETE")
+    out.print(f"Iterations: {len(iterations)}")
+    out.print(f"Final Quality Score: {quality_score}/10")
+    out.print(f"Threshold Met: {quality_threshold_met}")
+    out.print(f"{'='*80}")
 
-    print(f"\n{'='*80}")
-    print(f"FINAL CONTENT:")
-    print(f"{'='*80}")
-    print(current_content)
-    print(f"{'='*80}\n")
+    out.banner("FINAL CONTENT:")
+    out.print(current_content)
+    out.print(f"{'='*80}\n")
+    out.flush()
 
     return ReflexionResult(
         topic=topic,
@@ -305,6 +626,354 @@ Return ONLY the improved content."""
     )
 
 
+@env.task
+async def reflexion_batch_workflow(
+    topics: List[str],
+    max_concurrency: int = 10,
+    rate_limit: int = 500,
+    quality_threshold: float = 8.0,
+    max_iterations: int = 5,
+    num_candidates: int = 1,
+    max_call_concurrency: int = 4,
+    strict_phases: bool = False,
+    use_cache: bool = True,
+    critic_model: str = CRITIC_MODEL,
+    critic_escalate_model: str = CRITIC_ESCALATE_MODEL,
+    full_critique_every: int = 3,
+    ensemble_critics: bool = False,
+    batch_mode: bool = False
+) -> List[ReflexionResult]:
+    """
+    Run reflexion_workflow for many topics with bounded concurrency.
+
+    At most `max_concurrency` topics run at once, and topic starts are spaced
+    so no more than `rate_limit` begin per minute. This smooths the initial
+    burst of research/draft requests; per-call limits inside each topic still
+    come from max_call_concurrency.
+
+    Args:
+        topics: Topics to write about
+        max_concurrency: Maximum topics processed at the same time
+        rate_limit: Maximum topic starts per minute
+        batch_mode: For offline runs - write every initial draft first, critique all
+            of them in one OpenAI Batch API job, then refine each topic
+        (remaining arguments are passed to reflexion_workflow)
+
+    Returns:
+        List[ReflexionResult]: One result per topic, in input order
+    """
+    print(f"[Reflexion Batch] {len(topics)} topic(s), up to {max_concurrency} at once")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    start_lock = asyncio.Lock()
+    start_interval = 60.0 / rate_limit if rate_limit > 0 else 0.0
+    loop = asyncio.get_running_loop()
+    next_start: Optional[float] = None
+
+    async def wait_for_start_slot():
+        nonlocal next_start
+        async with start_lock:
+            now = loop.time()
+            if next_start is not None and next_start > now:
+                await asyncio.sleep(next_start - now)
+            next_start = loop.time() + start_interval
+
+    async def run_one(topic: str) -> ReflexionResult:
+        async with semaphore:
+            await wait_for_start_slot()
+            return await reflexion_workflow(
+                topic=topic,
+                quality_threshold=quality_threshold,
+                max_iterations=max_iterations,
+                num_candidates=num_candidates,
+                max_call_concurrency=max_call_concurrency,
+                strict_phases=strict_phases,
+                use_cache=use_cache,
+                critic_model=critic_model,
+                critic_escalate_model=critic_escalate_model,
+                full_critique_every=full_critique_every,
+                ensemble_critics=ensemble_critics
+            )
+
+    async def draft_one(topic: str) -> Tuple[str, str]:
+        async with semaphore:
+            await wait_for_start_slot()
+            return await research_and_draft(topic, strict_phases, use_cache)
+
+    async def refine_one(topic: str, draft: Tuple[str, str], critique: Optional[Dict]) -> ReflexionResult:
+        async with semaphore:
+            return await refine_content(
+                topic=topic,
+                research_summary=draft[0],
+                current_content=draft[1],
+                quality_threshold=quality_threshold,
+                max_iterations=max_iterations,
+                num_candidates=num_candidates,
+                max_call_concurrency=max_call_concurrency,
+                use_cache=use_cache,
+                critic_model=critic_model,
+                critic_escalate_model=critic_escalate_model,
+                full_critique_every=full_critique_every,
+                ensemble_critics=ensemble_critics,
+                first_critique=critique
+            )
+
+    if batch_mode:
+        drafts = await asyncio.gather(*[draft_one(topic) for topic in topics])
+        client = get_openai_client()
+        first_critiques = await batch_critiques(client, [content for _, content in drafts], critic_model)
+        results = await asyncio.gather(*[
+            refine_one(topic, draft, critique)
+            for topic, draft, critique in zip(topics, drafts, first_critiques)
+        ])
+    else:
+        results = await asyncio.gather(*[run_one(topic) for topic in topics])
+
+    met = sum(1 for result in results if result.quality_threshold_met)
+    print(f"[Reflexion Batch] Done: {met}/{len(results)} topic(s) met the quality threshold")
+    return list(results)
+
+
+def _format_critique(critique: Dict) -> str:
+    """Render a parsed critique as the text stored per iteration and passed to the editor."""
+    return "\n".join((
+        f"Quality Score: {critique['overall_score']}/10",
+        "",
+        "Strengths: " + ", ".join(critique["strengths"]),
+        "Weaknesses: " + ", ".join(critique["weaknesses"]),
+        "",
+        "Specific Improvements:",
+        critique["specific_improvements"],
+    ))
+
+
+def _persona_prompt(system_prompt: str, persona: Optional[str]) -> str:
+    """Append a critic persona to a system prompt (after the shared prefix)."""
+    if persona is None:
+        return system_prompt
+    return f"{system_prompt}\nJudge the content from the perspective of a {persona}.\n"
+
+
+def critique_request(content: str, model: str = CRITIC_MODEL, persona: Optional[str] = None) -> Dict:
+    """Build the chat completion arguments (model, temperature, format, messages) for a critique."""
+    return {
+        "model": model,
+        "temperature": 0.0,
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": "Critique", "schema": CRITIQUE_SCHEMA, "strict": True}
+        },
+        "messages": [
+            # Identical prefix on every call, so the provider's prompt cache can reuse it
+            {"role": "system", "content": _persona_prompt(SYSTEM_CRITIC, persona)},
+            {"role": "user", "content": content}
+        ],
+    }
+
+
+def revision_diff(previous: str, current: str) -> Optional[str]:
+    """
+    Unified diff of a revision for a delta critique.
+
+    Returns:
+        str: The diff, or None if more than DELTA_CRITIQUE_MAX_CHANGE of the lines
+            changed (the critic should then see the full content)
+    """
+    old_lines, new_lines = previous.splitlines(), current.splitlines()
+    diff = list(difflib.unified_diff(old_lines, new_lines, lineterm="", n=2))
+    changed = sum(1 for line in diff[2:] if line[:1] in "+-")
+    if changed > DELTA_CRITIQUE_MAX_CHANGE * max(len(old_lines) + len(new_lines), 1):
+        return None
+    return "\n".join(diff)
+
+
+def delta_critique_request(
+    previous_critique: Dict,
+    diff: str,
+    model: str = CRITIC_MODEL,
+    persona: Optional[str] = None
+) -> Dict:
+    """Build the chat completion arguments for re-scoring a revision from its diff."""
+    return {
+        **critique_request("", model),
+        "messages": [
+            {"role": "system", "content": _persona_prompt(SYSTEM_DELTA_CRITIC, persona)},
+            {"role": "user", "content": (
+                f"Previous critique:\n{_format_critique(previous_critique)}\n\n"
+                f"Changes made (unified diff):\n{diff}"
+            )}
+        ],
+    }
+
+
+async def critique_content(
+    client: AsyncOpenAI,
+    content: str,
+    semaphore: asyncio.Semaphore,
+    use_cache: bool = True,
+    on_improvements: Optional[Callable[[Dict], None]] = None,
+    model: str = CRITIC_MODEL,
+    previous: Optional[Tuple[str, Dict]] = None,
+    persona: Optional[str] = None,
+    initial_draft: bool = False
+) -> Dict:
+    """
+    Score a draft with the critic LLM (through the critique cache unless use_cache is False).
+
+    With `on_improvements`, the critique is streamed and the callback receives
+    the partial critique (scores, strengths, weaknesses, specific_improvements)
+    as soon as the specific_improvements field closes, while the model is still
+    generating the rest. It is not called when the critique comes from cache.
+
+    With `previous` (the content this draft was revised from and its critique),
+    the critic only sees the prior critique and a diff of the revision, unless
+    the revision rewrote too much of the draft (see revision_diff).
+
+    Only the full CRITIC_MODEL critique of an `initial_draft` may come from a
+    semantically similar cached draft (e.g. the same topic on an earlier run).
+    Revisions are too similar to their predecessor and would get its stale score,
+    and the index is keyed by content alone, so persona, delta and escalated
+    critiques would get another kind of critique back. Those are cached exactly.
+
+    Returns:
+        dict: Parsed critique with overall_score, strengths, weaknesses, etc.
+    """
+    diff = revision_diff(previous[0], content) if previous is not None else None
+    if diff is not None:
+        request = delta_critique_request(previous[1], diff, model, persona)
+    else:
+        request = critique_request(content, model, persona)
+    semantic = initial_draft and diff is None and persona is None and model == CRITIC_MODEL
+
+    on_chunk = None
+    if on_improvements is not None:
+        scanner = JsonObjectScanner()
+        fields: Dict = {}
+
+        def on_chunk(delta: str):
+            for kind, key, value in scanner.feed(delta):
+                if kind != "field":
+                    continue
+                fields[key] = value
+                if key == "specific_improvements":
+                    on_improvements(dict(fields))
+
+    async with semaphore:
+        if use_cache:
+            raw_critique = await get_critique_cache().chat(
+                client,
+                semantic_text=content if semantic else None,
+                label="[Critique Cache]",
+                on_chunk=on_chunk,
+                **request
+            )
+        elif on_chunk is not None:
+            raw_critique = await stream_chat(client, on_chunk, **request)
+        else:
+            critique_response = await client.chat.completions.create(**request)
+            raw_critique = critique_response.choices[0].message.content
+
+    # Structured outputs guarantee the response matches CRITIQUE_SCHEMA
+    return orjson.loads(raw_critique)
+
+
+async def ensemble_critique(
+    client: AsyncOpenAI,
+    content: str,
+    semaphore: asyncio.Semaphore,
+    use_cache: bool = True,
+    model: str = CRITIC_MODEL,
+    previous: Optional[Tuple[str, Dict]] = None
+) -> Dict:
+    """
+    Critique a draft once per CRITIC_PERSONAS entry, concurrently, and merge the results.
+
+    Scores are the median across personas; strengths and weaknesses are the
+    de-duplicated union, and the improvement suggestions are concatenated.
+
+    Returns:
+        dict: Merged critique with the same fields as critique_content
+    """
+    critiques = await asyncio.gather(*[
+        critique_content(client, content, semaphore, use_cache, model=model, previous=previous, persona=persona)
+        for persona in CRITIC_PERSONAS
+    ])
+
+    merged = {field: statistics.median(c[field] for c in critiques) for field in CRITIQUE_SCORE_FIELDS}
+    merged["strengths"] = list(dict.fromkeys(s for c in critiques for s in c["strengths"]))
+    merged["weaknesses"] = list(dict.fromkeys(w for c in critiques for w in c["weaknesses"]))
+    merged["specific_improvements"] = " ".join(
+        f"({persona}) {c['specific_improvements']}" for persona, c in zip(CRITIC_PERSONAS, critiques)
+    )
+    merged["meets_threshold"] = sum(c["meets_threshold"] for c in critiques) * 2 > len(critiques)
+    return merged
+
+
+async def batch_critiques(
+    client: AsyncOpenAI,
+    contents: List[str],
+    model: str = CRITIC_MODEL,
+    poll_interval: float = BATCH_POLL_INTERVAL
+) -> List[Optional[Dict]]:
+    """
+    Critique many drafts through the OpenAI Batch API (half the price of interactive calls).
+
+    Writes one /v1/chat/completions request per draft to a JSONL file, submits it
+    as a batch, and polls until the batch finishes.
+
+    Returns:
+        list: Parsed critique per draft, or None for drafts whose request failed
+            (callers fall back to an interactive critique)
+    """
+    lines = [
+        orjson.dumps({
+            "custom_id": f"draft-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": critique_request(content, model),
+        })
+        for i, content in enumerate(contents)
+    ]
+    batch_file = await client.files.create(file=("critiques.jsonl", b"\n".join(lines)), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"[Reflexion Batch] Submitted batch {batch.id} with {len(contents)} critique request(s)")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(poll_interval)
+        batch = await client.batches.retrieve(batch.id)
+        print(f"[Reflexion Batch] Batch {batch.id}: {batch.status}")
+
+    critiques: List[Optional[Dict]] = [None] * len(contents)
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"[Reflexion Batch] Batch ended with status '{batch.status}', critiquing interactively")
+        return critiques
+
+    output = await client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        record = orjson.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        idx = int(record["custom_id"].split("-", 1)[1])
+        critiques[idx] = orjson.loads(response["body"]["choices"][0]["message"]["content"])
+    return critiques
+
+
+async def revise_content(content: str, critique_text: str, variant: str, semaphore: asyncio.Semaphore) -> str:
+    """Revise a draft with the editor agent, optionally steered by a variant instruction."""
+    revision_task = REVISION_TEMPLATE.format(variant=variant, critique=critique_text, content=content)
+
+    async with semaphore:
+        revision_result = await editor_agent(revision_task)
+    return revision_result.final_result
+
+
 # ----------------------------------
 # CLI Entry Point
 # ----------------------------------
@@ -314,19 +983,26 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(
         description="Reflexion workflow - iterative content improvement",
-        epilog="Example: python -m workflows.flyte_reflexion --local --topic 'Benefits of async programming in Python'"
+        epilog="Example: python -m workflows.flyte_reflexion --local --topic 'Benefits of async programming in Python'\n"
+               "Batch:   python -m workflows.flyte_reflexion --local --topics-file topics.txt --max-concurrency 10",
+        formatter_class=argparse.RawDescriptionHelpFormatter
     )
     parser.add_argument(
         "--local",
         action="store_true",
         help="Run workflow locally using flyte.init() instead of remote execution"
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--topic",
         type=str,
-        required=True,
         help="The topic to write about"
     )
+    source.add_argument(
+        "--topics-file",
+        type=str,
+        help="Text file with one topic per line; runs reflexion_batch_workflow"
+    )
     parser.add_argument(
         "--quality-threshold",
         type=float,
@@ -339,6 +1015,68 @@ if __name__ == "__main__":
         default=5,
         help="Maximum refinement iterations (default: 5)"
     )
+    parser.add_argument(
+        "--num-candidates",
+        type=int,
+        default=1,
+        help="Revision candidates generated and critiqued in parallel per iteration (default: 1)"
+    )
+    parser.add_argument(
+        "--max-call-concurrency",
+        type=int,
+        default=4,
+        help="Maximum concurrent critique/editor calls per topic (default: 4)"
+    )
+    parser.add_argument(
+        "--strict-phases",
+        action="store_true",
+        help="Research before drafting instead of drafting a skeleton in parallel"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the critic LLM and web search instead of reusing cached critiques and research"
+    )
+    parser.add_argument(
+        "--critic-model",
+        type=str,
+        default=CRITIC_MODEL,
+        help=f"Model for routine critiques (default: {CRITIC_MODEL})"
+    )
+    parser.add_argument(
+        "--critic-escalate-model",
+        type=str,
+        default=CRITIC_ESCALATE_MODEL,
+        help=f"Model that re-scores borderline critiques; empty to disable (default: {CRITIC_ESCALATE_MODEL})"
+    )
+    parser.add_argument(
+        "--full-critique-every",
+        type=int,
+        default=3,
+        help="Critique the full content every N iterations; in between, score revisions from their diff (default: 3, 1 = always full)"
+    )
+    parser.add_argument(
+        "--ensemble-critics",
+        action="store_true",
+        help=f"Score each draft with {len(CRITIC_PERSONAS)} critic personas in parallel and use the median"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=10,
+        help="With --topics-file: maximum topics processed at once (default: 10)"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=500,
+        help="With --topics-file: maximum topic starts per minute (default: 500)"
+    )
+    parser.add_argument(
+        "--batch-mode",
+        action="store_true",
+        help="With --topics-file: critique all initial drafts via the OpenAI Batch API (slower, half price)"
+    )
 
     args = parser.parse_args()
 
@@ -350,19 +1088,45 @@ if __name__ == "__main__":
         print("Running workflow REMOTELY with flyte.init_from_config()")
         flyte.init_from_config(".flyte/config.yaml")
 
-    print(f"\n=== Reflexion Content Creation Workflow ===")
-    print(f"Topic: {args.topic}")
-    print(f"Quality Threshold: {args.quality_threshold}/10")
-    print(f"Max Iterations: {args.max_iterations}\n")
-
-    # Execute the workflow
-    execution = flyte.run(
-        reflexion_workflow,
-        topic=args.topic,
+    workflow_options = dict(
         quality_threshold=args.quality_threshold,
-        max_iterations=args.max_iterations
+        max_iterations=args.max_iterations,
+        num_candidates=args.num_candidates,
+        max_call_concurrency=args.max_call_concurrency,
+        strict_phases=args.strict_phases,
+        use_cache=not args.no_cache,
+        critic_model=args.critic_model,
+        critic_escalate_model=args.critic_escalate_model,
+        full_critique_every=args.full_critique_every,
+        ensemble_critics=args.ensemble_critics
     )
 
+    if args.topics_file:
+        with open(args.topics_file) as f:
+            topics = [line.strip() for line in f if line.strip()]
+
+        print(f"\n=== Reflexion Batch Workflow ===")
+        print(f"Topics: {len(topics)} (max {args.max_concurrency} at once)")
+        print(f"Quality Threshold: {args.quality_threshold}/10")
+        print(f"Max Iterations: {args.max_iterations}\n")
+
+        execution = flyte.run(
+            reflexion_batch_workflow,
+            topics=topics,
+            max_concurrency=args.max_concurrency,
+            rate_limit=args.rate_limit,
+            batch_mode=args.batch_mode,
+            **workflow_options
+        )
+    else:
+        print(f"\n=== Reflexion Content Creation Workflow ===")
+        print(f"Topic: {args.topic}")
+        print(f"Quality Threshold: {args.quality_threshold}/10")
+        print(f"Max Iterations: {args.max_iterations}\n")
+
+        # Execute the workflow
+        execution = flyte.run(reflexion_workflow, topic=args.topic, **workflow_options)
+
     print(f"\n{'='*80}")
     print(f"Execution: {execution.name}")
     print(f"URL: {execution.url}")
@@ -8,8 +8,8 @@ allowing independent scaling, resource allocation, and container configuration.
 
 import sys
 from pathlib import Path
-from typing import List, Dict
-from dataclasses import dataclass
+from typing import List, Dict, Optional
+from dataclasses import dataclass, asdict
 import flyte
 import asyncio
 
@@ -18,23 +18,39 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 # Import agents (they are now Flyte tasks with their own environments)
+from agents import AGENTS, SUMMARY_ATTRS, agent_slot
 from agents.planner_agent import planner_agent, PlannerDecision, AgentStep
-from agents.math_agent import math_agent, MathAgentResult
-from agents.string_agent import string_agent, StringAgentResult
-from agents.web_search_agent import web_search_agent, WebSearchAgentResult
-from agents.code_agent import code_agent, CodeAgentResult
-from agents.weather_agent import weather_agent, WeatherAgentResult
 from config import base_env
 from utils.logger import Logger
+from utils.plan_cache import PlanCache, plan_fingerprint, adapt_plan_steps
+from utils.response_cache import ResponseCache
+from utils.exec_cache import memoize
+from utils.dag_scheduler import build_dependency_graph, run_dag
+from utils.summarizer import rule_summarize
 
 # Initialize logger for orchestrator
 logger = Logger(path="agent_trace_log.jsonl", verbose=False)
 
+# Plans keyed by request keywords, so recurring requests skip the planner LLM call
+plan_cache = PlanCache(path="plan_cache.jsonl")
+
+# Complete results for identical requests (1 hour TTL), checked before the plan cache.
+# Created on first use so importing the module does not touch the filesystem.
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the workflow response cache, loading it from disk on first call."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
 # ----------------------------------
 # Data Models for Orchestrator
 # ----------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class AgentExecution:
     """Single agent execution with its result"""
     agent: str
@@ -44,7 +60,7 @@ class AgentExecution:
     error: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskResult:
     """Final result from dynamic task execution"""
     planner_decision_summary: str
@@ -83,126 +99,133 @@ async def execute_dynamic_task(user_request: str) -> TaskResult:
     """
     print(f"[Orchestrator] User request: {user_request}")
 
-    # Step 1: Call planner task to create execution plan
-    print("[Orchestrator] Step 1: Calling planner agent...")
-    planner_decision = await planner_agent(user_request)
+    # Step 0: Identical request seen recently - return its result without any LLM calls
+    cached = await get_response_cache().get(user_request)
+    if cached:
+        print("[Orchestrator] Response cache hit, skipping planner and agents")
+        return TaskResult(
+            planner_decision_summary=cached["planner_decision_summary"],
+            agent_executions=[AgentExecution(**execution) for execution in cached["agent_executions"]],
+            final_result=cached["final_result"]
+        )
+
+    # Step 1: Reuse a cached plan for this kind of request, or call the planner task
+    fingerprint = plan_fingerprint(user_request)
+    cached_plan = plan_cache.get(fingerprint)
+
+    steps = None
+    if cached_plan:
+        print(f"[Orchestrator] Step 1: Plan cache hit for '{fingerprint}'")
+        steps = cached_plan["steps"]
+        if cached_plan["request"].strip().lower() != user_request.strip().lower():
+            # Same kind of request with different details - adapt the task strings only.
+            # None means adaptation failed; plan from scratch below.
+            steps = await adapt_plan_steps(cached_plan["request"], steps, user_request)
+
+    if steps is not None:
+        planner_decision = PlannerDecision(steps=[AgentStep(**step) for step in steps])
+    else:
+        print("[Orchestrator] Step 1: Calling planner agent...")
+        planner_decision = await planner_agent(user_request)
+
     print(f"[Orchestrator] Planner created plan with {len(planner_decision.steps)} step(s)")
 
+    # Build the dependency graph once; the scheduler consumes it directly
+    graph = build_dependency_graph(planner_decision.steps)
+
     # Step 2: Execute agent tasks with dependency-aware parallelism
     # Store completed results indexed by step number
     completed_results: Dict[int, AgentExecution] = {}
+    # Dependency-context line for each completed step, formatted once at completion
+    summary_line: Dict[int, str] = {}
+
+    async def execute_step(step_idx: int, step: AgentStep) -> AgentExecution:
+        """Execute a single agent step"""
+        print(f"[Orchestrator]   Step {step_idx}: Calling {step.agent} agent...")
+        print(f"[Orchestrator]     Task: {step.task}")
+
+        # If this step has dependencies, augment the task with dependency results
+        task = step.task
+        if step.dependencies:
+            # Prepend dependency results to the task (invalid indices are skipped)
+            task = "Context from previous steps:\n" + "\n".join(
+                summary_line[dep_idx] for dep_idx in step.dependencies if dep_idx in summary_line
+            ) + f"\n\nYour task: {task}"
+            print(f"[Orchestrator]     Augmented task with {len(step.dependencies)} dependency result(s)")
+
+        # Route to appropriate agent task (use augmented task if dependencies exist)
+        agent_fn = AGENTS.get(step.agent)
+        if agent_fn is None:
+            # Fallback for unknown agent
+            print(f"[Orchestrator] WARNING: Unknown agent '{step.agent}'")
+            result_full = ""
+            result_summary = ""
+            error = f"Unknown agent: {step.agent}"
+        else:
+            async def call_agent():
+                # Bounded concurrency: global cap plus per-agent caps (see agents/__init__.py)
+                async with agent_slot(step.agent):
+                    return await agent_fn(task)
+
+            # Identical (agent, task) pairs seen earlier in this process are served from cache
+            agent_result = await memoize(step.agent, task, call_agent, cache_if=lambda r: not r.error)
+            result_full = agent_result.final_result
+            # Agents listed in SUMMARY_ATTRS pass a shorter field downstream
+            result_summary = getattr(agent_result, SUMMARY_ATTRS.get(step.agent, "final_result"), "") or agent_result.final_result
+            error = agent_result.error
+
+        print(f"[Orchestrator]   Step {step_idx} completed: {result_summary[:100]}...")
+        # Pass a compact rule-based summary downstream, not the full output
+        summary_line[step_idx] = f"Step {step_idx} ({step.agent}): {rule_summarize(result_summary)}"
+
+        # Log to trace file
+        await logger.log(
+            step_idx=step_idx,
+            agent=step.agent,
+            input_task=task,
+            output_full=result_full,
+            output_summary=result_summary,
+            output_full_length=len(result_full),
+            output_summary_length=len(result_summary),
+            error=error,
+            dependencies=step.dependencies
+        )
+
+        return AgentExecution(
+            agent=step.agent,
+            task=step.task,
+            result_summary=result_summary,
+            result_full=result_full,
+            error=error
+        )
+
+    def skipped_step(step_idx: int, step: AgentStep, failed_idx: int) -> AgentExecution:
+        return AgentExecution(
+            agent=step.agent,
+            task=step.task,
+            result_summary="",
+            result_full="",
+            error=f"Skipped: upstream error in step {failed_idx}"
+        )
+
+    # Run steps in dependency order; independent steps execute concurrently and
+    # steps downstream of a failed step are skipped without calling their agent
+    await run_dag(
+        planner_decision.steps, execute_step, completed_results, label="[Orchestrator]", graph=graph,
+        is_error=lambda execution: bool(execution.error), make_skipped=skipped_step
+    )
 
-    # Track which steps are ready to execute (no pending dependencies)
-    pending_steps = list(enumerate(planner_decision.steps))
-
-    while pending_steps:
-        # Find all steps that can execute now (dependencies satisfied)
-        ready_steps = []
-        remaining_steps = []
-
-        for step_idx, step in pending_steps:
-            # Check if all dependencies are completed
-            deps_satisfied = all(dep_idx in completed_results for dep_idx in step.dependencies)
-
-            if deps_satisfied:
-                ready_steps.append((step_idx, step))
-            else:
-                remaining_steps.append((step_idx, step))
-
-        if not ready_steps:
-            # This shouldn't happen with valid dependency graphs, but handle it gracefully
-            print("[Orchestrator] ERROR: No steps ready to execute, but pending steps remain (circular dependency?)")
-            break
-
-        print(f"[Orchestrator] Executing {len(ready_steps)} step(s) in parallel...")
-
-        # Execute all ready steps in parallel
-        async def execute_step(step_idx: int, step: AgentStep) -> tuple:
-            """Execute a single agent step"""
-            print(f"[Orchestrator]   Step {step_idx}: Calling {step.agent} agent...")
-            print(f"[Orchestrator]     Task: {step.task}")
-
-            # If this step has dependencies, augment the task with dependency results
-            task = step.task
-            if step.dependencies:
-                dep_results = []
-                for dep_idx in step.dependencies:
-                    dep_exec = completed_results[dep_idx]
-                    dep_results.append(f"Step {dep_idx} ({dep_exec.agent}): {dep_exec.result_summary}")
-
-                # Prepend dependency results to the task
-                task = f"Context from previous steps:\n" + "\n".join(dep_results) + f"\n\nYour task: {task}"
-                print(f"[Orchestrator]     Augmented task with {len(step.dependencies)} dependency result(s)")
-
-            # Route to appropriate agent task (use augmented task if dependencies exist)
-            if step.agent == "math":
-                agent_result = await math_agent(task)
-                result_full = agent_result.final_result
-                result_summary = agent_result.final_result  # Math results are already concise
-                error = agent_result.error
-            elif step.agent == "string":
-                agent_result = await string_agent(task)
-                result_full = agent_result.final_result
-                result_summary = agent_result.final_result  # String results are already concise
-                error = agent_result.error
-            elif step.agent == "web_search":
-                agent_result = await web_search_agent(task)
-                result_full = agent_result.final_result
-                # Web search results can be large, use summary if available
-                result_summary = getattr(agent_result, 'summary', agent_result.final_result)
-                error = agent_result.error
-            elif step.agent == "code":
-                agent_result = await code_agent(task)
-                result_full = agent_result.final_result
-                result_summary = agent_result.final_result  # Code results are typically concise
-                error = agent_result.error
-            elif step.agent == "weather":
-                agent_result = await weather_agent(task)
-                result_full = agent_result.final_result
-                result_summary = agent_result.final_result  # Weather results are already concise
-                error = agent_result.error
-            else:
-                # Fallback for unknown agent
-                print(f"[Orchestrator] WARNING: Unknown agent '{step.agent}'")
-                result_full = ""
-                result_summary = ""
-                error = f"Unknown agent: {step.agent}"
-
-            print(f"[Orchestrator]   Step {step_idx} completed: {result_summary[:100]}...")
-
-            # Log to trace file
-            await logger.log(
-                step_idx=step_idx,
-                agent=step.agent,
-                input_task=task,
-                output_full=result_full,
-                output_summary=result_summary,
-                output_full_length=len(result_full),
-                output_summary_length=len(result_summary),
-                error=error,
-                dependencies=step.dependencies
-            )
-
-            return step_idx, AgentExecution(
-                agent=step.agent,
-                task=step.task,
-                result_summary=result_summary,
-                result_full=result_full,
-                error=error
-            )
-
-        # Execute all ready steps concurrently
-        results = await asyncio.gather(*[execute_step(idx, step) for idx, step in ready_steps])
-
-        # Store completed results
-        for step_idx, execution in results:
-            completed_results[step_idx] = execution
-
-        # Update pending steps
-        pending_steps = remaining_steps
-
-    # Convert to list in original order
-    agent_executions = [completed_results[i] for i in range(len(planner_decision.steps))]
+    # Convert to list in original order (steps that never became ready are reported as errors)
+    agent_executions = [
+        completed_results.get(i) or AgentExecution(
+            agent=step.agent,
+            task=step.task,
+            result_summary="",
+            result_full="",
+            error="Not executed: unresolved dependencies"
+        )
+        for i, step in enumerate(planner_decision.steps)
+    ]
 
     # Collect final results
     final_results = []
@@ -219,12 +242,23 @@ async def execute_dynamic_task(user_request: str) -> TaskResult:
         [f"{s.agent}" for s in planner_decision.steps]
     )
 
-    return TaskResult(
+    # Trace records are written in the background; make sure they hit disk
+    await logger.flush()
+
+    result = TaskResult(
         planner_decision_summary=planner_summary,
         agent_executions=agent_executions,
         final_result=combined_result
     )
 
+    # Only cache fully successful runs so failures are retried (and replanned) next time
+    if not any(execution.error for execution in agent_executions):
+        await get_response_cache().put(user_request, asdict(result))
+        if steps is None:
+            plan_cache.put(fingerprint, user_request, [asdict(step) for step in planner_decision.steps])
+
+    return result
+
 
 # ----------------------------------
 # Local Execution Helper
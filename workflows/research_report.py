@@ -20,12 +20,15 @@ Usage:
 
 import sys
 from pathlib import Path
-from typing import List
+from typing import Callable, List, Optional
 from dataclasses import dataclass
 import flyte
 import flyte.report
 import asyncio
-import json
+import difflib
+import html
+import re
+import string
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
@@ -35,13 +38,230 @@ sys.path.insert(0, str(project_root))
 from agents.web_search_agent import web_search_agent
 from agents.writer_agent import writer_agent
 from agents.editor_agent import editor_agent
-from config import base_env, OPENAI_API_KEY
+from config import base_env, RESEARCH_CONCURRENCY, VERBOSE
 from utils.logger import Logger
+from utils.console import ConsoleBuffer
+from utils.json_parse import parse_llm_json
+from utils.json_stream import JsonObjectScanner
+from utils.llm_cache import LLMCache, FileBackend, stream_chat
+from utils.llm_client import get_openai_client
 from openai import AsyncOpenAI
 
 # Initialize logger
 logger = Logger(path="research_report_log.jsonl", verbose=True)
 
+# Minimum score increase per revision; below this the quality loop stops early
+MIN_SCORE_GAIN = 0.2
+
+# Report status line for each reason the quality loop can stop
+STOP_REASON_STATUS = {
+    "threshold": "✅ Threshold met!",
+    "plateau": "⏹️ Score plateaued",
+    "max_iterations": "⚠️ Max iterations reached",
+}
+
+# Subtopics at least this similar to one already being researched are skipped
+SUBTOPIC_DUP_RATIO = 0.85
+
+# Markdown -> HTML conversion for the final report tab
+_HEADER_RE = re.compile(r"^(#{1,3}) (.+)$", re.MULTILINE)
+_PARA_RE = re.compile(r"\n\n")
+
+
+def _header_html(match: "re.Match") -> str:
+    level = len(match.group(1))
+    return f"<h{level}>{match.group(2)}</h{level}>"
+
+
+def _is_duplicate_subtopic(subtopic: str, existing: List[str]) -> bool:
+    """Whether `subtopic` is a near-duplicate (case-insensitive) of any in `existing`."""
+    subtopic = subtopic.lower()
+    return any(
+        difflib.SequenceMatcher(None, subtopic, other.lower()).ratio() > SUBTOPIC_DUP_RATIO
+        for other in existing
+    )
+
+
+# Prompt bodies, filled in with str.format (literal JSON braces are doubled)
+_PLANNING_PROMPT_TMPL = """Analyze this research topic and identify 3-4 specific subtopics to research:
+
+Topic: {topic}
+
+Create a research plan with specific subtopics that will provide comprehensive coverage.
+
+Example - If topic is "async Python frameworks":
+- Subtopic 1: asyncio library features and use cases
+- Subtopic 2: Alternative frameworks (Trio, Curio)
+- Subtopic 3: Performance comparison and benchmarks
+- Subtopic 4: Best practices and common patterns
+
+Respond in JSON format:
+{{
+  "subtopics": [
+    "Subtopic 1 description",
+    "Subtopic 2 description",
+    "Subtopic 3 description"
+  ],
+  "research_approach": "Brief description of the research strategy"
+}}
+"""
+
+_SYNTHESIS_PROMPT_TMPL = """Synthesize this research into a structured outline for a report:
+
+Topic: {topic}
+
+Research Findings:
+{combined_research}
+
+Create a structured outline with key points. Respond in JSON:
+{{
+  "main_themes": ["Theme 1", "Theme 2", "Theme 3"],
+  "key_findings": ["Finding 1", "Finding 2", "Finding 3"],
+  "suggested_structure": ["Section 1", "Section 2", "Section 3"]
+}}
+"""
+
+_WRITING_PROMPT_TMPL = """Write a comprehensive research report about: {topic}
+
+Research Findings:
+{combined_research}
+
+Main Themes: {themes}
+
+Requirements:
+- Engaging title
+- Well-structured sections
+- 500-700 words
+- Include key findings from research
+- Professional tone
+- Proper markdown formatting
+"""
+
+_CRITIQUE_PROMPT_TMPL = """Evaluate this research report:
+
+{content}
+
+Rate on these criteria (0-10):
+1. Clarity - Easy to understand?
+2. Structure - Well organized?
+3. Completeness - Covers topic thoroughly?
+4. Accuracy - Information correct?
+5. Engagement - Interesting to read?
+
+Respond in JSON:
+{{
+  "overall_score": 8.5,
+  "clarity_score": 9.0,
+  "structure_score": 8.0,
+  "completeness_score": 8.5,
+  "accuracy_score": 9.0,
+  "engagement_score": 8.0,
+  "strengths": ["strength 1", "strength 2"],
+  "weaknesses": ["weakness 1", "weakness 2"],
+  "specific_improvements": "Detailed suggestions..."
+}}
+"""
+
+_REVISION_PROMPT_TMPL = """Improve this content:
+
+{content}
+
+Critique:
+{critique}
+
+Address all weaknesses and apply suggestions. Return ONLY the improved content.
+"""
+
+# Flyte report HTML (string.Template, so the CSS braces need no escaping).
+# Values are substituted as given; callers html.escape any LLM or user text.
+_RESEARCH_CARD_TMPL = string.Template("""
+        <div style="background: white; border-left: 4px solid #3498db; padding: 15px; margin: 15px 0; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+            <h3 style="color: #2980b9; margin-top: 0;">
+                $index. $subtopic
+            </h3>
+            <div style="color: #555; line-height: 1.6;">
+                $summary
+            </div>
+            <p style="color: #7f8c8d; font-size: 0.9em; margin-top: 10px;">
+                ✓ $findings_length characters of research data
+            </p>
+        </div>
+""")
+
+_QUALITY_CARD_TMPL = string.Template("""
+        <div style="background: white; border-left: 4px solid $color; padding: 15px; margin: 15px 0; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+            <h3 style="color: #2c3e50; margin-top: 0;">
+                Iteration $iteration
+                <span style="float: right; color: $color; font-size: 1.2em;">$score/10</span>
+            </h3>
+            <div style="margin: 10px 0;">
+                <p style="margin: 5px 0;"><strong>Strengths:</strong> $strengths</p>
+                <p style="margin: 5px 0;"><strong>Weaknesses:</strong> $weaknesses</p>
+                <p style="margin: 5px 0;"><strong>Improvements:</strong> $improvements</p>
+            </div>
+        </div>
+""")
+
+_RESEARCH_HEADER_TMPL = string.Template("""
+    <div style="font-family: Arial, sans-serif; max-width: 1200px; margin: 0 auto; padding: 20px;">
+        <h1 style="color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px;">
+            🔍 Research Results
+        </h1>
+        <div style="background: #ecf0f1; padding: 15px; border-radius: 8px; margin: 20px 0;">
+            <h2 style="color: #34495e; margin-top: 0;">Topic: $topic</h2>
+            <p><strong>Subtopics researched:</strong> $count</p>
+            <p><strong>Research approach:</strong> $approach</p>
+        </div>
+""")
+
+_QUALITY_HEADER_TMPL = string.Template("""
+    <div style="font-family: Arial, sans-serif; max-width: 1200px; margin: 0 auto; padding: 20px;">
+        <h1 style="color: #2c3e50; border-bottom: 3px solid #e74c3c; padding-bottom: 10px;">
+            📊 Quality Improvement Tracking
+        </h1>
+        <div style="background: #ecf0f1; padding: 15px; border-radius: 8px; margin: 20px 0;">
+            <h2 style="color: #34495e; margin-top: 0;">Quality Progression</h2>
+            <p><strong>Target threshold:</strong> $threshold/10</p>
+            <p><strong>Total iterations:</strong> $iterations</p>
+            <p><strong>Final score:</strong> <span style="color: #27ae60; font-size: 1.3em; font-weight: bold;">$score/10</span></p>
+            <p><strong>Status:</strong> $status</p>
+        </div>
+""")
+
+_FINAL_WRAPPER_TMPL = string.Template("""
+    <div style="font-family: Georgia, serif; max-width: 800px; margin: 0 auto; padding: 20px; background: white;">
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 8px 8px 0 0; margin: -20px -20px 20px -20px;">
+            <h1 style="margin: 0; font-size: 2em;">📄 Research Report</h1>
+            <p style="margin: 10px 0 0 0; opacity: 0.9;">Topic: $topic</p>
+            <p style="margin: 5px 0 0 0; opacity: 0.9;">Quality Score: $score/10 | $sources sources researched</p>
+        </div>
+        <div style="line-height: 1.8; color: #333;">
+            $content
+        </div>
+        <div style="margin-top: 40px; padding: 20px; background: #f8f9fa; border-radius: 8px; border-left: 4px solid #667eea;">
+            <h3 style="margin-top: 0;">Workflow Statistics</h3>
+            <ul style="list-style: none; padding: 0;">
+                <li>🔍 <strong>Research Tasks:</strong> $sources parallel searches</li>
+                <li>📊 <strong>Quality Iterations:</strong> $iterations refinement cycles</li>
+                <li>⭐ <strong>Final Score:</strong> $score/10</li>
+                <li>📝 <strong>Content Length:</strong> $length characters</li>
+            </ul>
+        </div>
+    </div>
+""")
+
+# Planning, synthesis and critique responses, keyed by (model, temperature, messages).
+# Created on first use so importing the module does not touch the filesystem.
+_report_cache: Optional[LLMCache] = None
+
+
+def get_report_cache() -> LLMCache:
+    """Return the research report response cache, loading it from disk on first call."""
+    global _report_cache
+    if _report_cache is None:
+        _report_cache = LLMCache(backend=FileBackend(path=".cache/research_report.jsonl"))
+    return _report_cache
+
 # ----------------------------------
 # Data Models
 # ----------------------------------
@@ -50,7 +270,7 @@ logger = Logger(path="research_report_log.jsonl", verbose=True)
 class ResearchResult:
     """Result from a single research task"""
     subtopic: str
-    findings: str
+    findings_length: int        # Size of the raw findings; only the summary is kept
     summary: str
 
 @dataclass
@@ -60,6 +280,9 @@ class QualityIteration:
     quality_score: float
     critique: str
     content: str
+    strengths: List[str]
+    weaknesses: List[str]
+    improvements: str
 
 @dataclass
 class ResearchWorkflowResult:
@@ -69,9 +292,10 @@ class ResearchWorkflowResult:
     research_results: List[ResearchResult]
     quality_iterations: List[QualityIteration]
     final_report: str
-    final_quality_score: float
+    final_quality_score: float      # Best score across iterations (that of final_report)
     total_research_tasks: int
     total_quality_iterations: int
+    stop_reason: str                # Why the quality loop stopped; a STOP_REASON_STATUS key
 
 
 # ----------------------------------
@@ -84,7 +308,8 @@ env = base_env
 async def research_report_workflow(
     topic: str,
     quality_threshold: float = 8.0,
-    max_quality_iterations: int = 3
+    max_quality_iterations: int = 3,
+    use_cache: bool = True
 ) -> ResearchWorkflowResult:
     """
     Demo workflow: Research Report Generator with Quality Control
@@ -100,323 +325,261 @@ async def research_report_workflow(
         topic: Main topic to research and write about
         quality_threshold: Minimum quality score (0-10) to achieve
         max_quality_iterations: Maximum refinement iterations
+        use_cache: Reuse cached planning/synthesis/critique responses for
+            identical prompts (e.g. re-running the demo on the same topic)
 
     Returns:
         ResearchWorkflowResult: Complete execution trace and final report
     """
 
-    print("=" * 80)
-    print("🎬 RESEARCH REPORT GENERATOR")
-    print("=" * 80)
-    print(f"📋 Topic: {topic}")
-    print(f"🎯 Quality Target: {quality_threshold}/10")
-    print("=" * 80)
+    # Banners only in interactive runs; progress lines are always shown
+    out = ConsoleBuffer(banners=VERBOSE)
+    if VERBOSE:
+        out.print("=" * 80)
+        out.print("🎬 RESEARCH REPORT GENERATOR")
+        out.print("=" * 80)
+        out.print(f"📋 Topic: {topic}")
+        out.print(f"🎯 Quality Target: {quality_threshold}/10")
+        out.print("=" * 80)
 
-    client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    # Shared per-loop client; the agents called below use the same connection pool
+    client = get_openai_client()
 
     # ----------------------------------
     # PHASE 1: INTELLIGENT PLANNING
     # ----------------------------------
-    print(f"\n{'='*80}")
-    print("PHASE 1: INTELLIGENT PLANNING 🧠")
-    print(f"{'='*80}")
-
-    planning_prompt = f"""Analyze this research topic and identify 3-4 specific subtopics to research:
-
-Topic: {topic}
-
-Create a research plan with specific subtopics that will provide comprehensive coverage.
+    out.banner("PHASE 1: INTELLIGENT PLANNING 🧠")
 
-Example - If topic is "async Python frameworks":
-- Subtopic 1: asyncio library features and use cases
-- Subtopic 2: Alternative frameworks (Trio, Curio)
-- Subtopic 3: Performance comparison and benchmarks
-- Subtopic 4: Best practices and common patterns
-
-Respond in JSON format:
-{{
-  "subtopics": [
-    "Subtopic 1 description",
-    "Subtopic 2 description",
-    "Subtopic 3 description"
-  ],
-  "research_approach": "Brief description of the research strategy"
-}}
-"""
-
-    print("\n🤔 Planning research strategy...")
-
-    planning_response = await client.chat.completions.create(
-        model="gpt-4o",
-        temperature=0.3,
-        messages=[{"role": "user", "content": planning_prompt}]
-    )
-
-    # Parse planning response
-    raw_plan = planning_response.choices[0].message.content
-
-    try:
-        plan_data = json.loads(raw_plan)
-    except json.JSONDecodeError:
-        import re
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', raw_plan, re.DOTALL)
-        if json_match:
-            plan_data = json.loads(json_match.group(1))
-        else:
-            json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', raw_plan, re.DOTALL)
-            if json_match:
-                plan_data = json.loads(json_match.group(0))
-            else:
-                raise ValueError("Could not parse planning response")
-
-    subtopics = plan_data["subtopics"]
-    research_approach = plan_data.get("research_approach", "Comprehensive research")
-
-    print(f"\n✅ Research plan created!")
-    print(f"📊 Approach: {research_approach}")
-    print(f"📚 Subtopics to research ({len(subtopics)}):")
-    for i, subtopic in enumerate(subtopics, 1):
-        print(f"   {i}. {subtopic}")
-
-    await logger.log(
-        phase="planning",
-        subtopics_count=len(subtopics),
-        subtopics=subtopics,
-        approach=research_approach
-    )
+    planning_prompt = _PLANNING_PROMPT_TMPL.format(topic=topic)
 
-    # ----------------------------------
-    # PHASE 2: PARALLEL RESEARCH (Dynamic Fanout!)
-    # ----------------------------------
-    print(f"\n{'='*80}")
-    print("PHASE 2: PARALLEL RESEARCH 🔍 (Dynamic Fanout)")
-    print(f"{'='*80}")
-    print(f"🚀 Launching {len(subtopics)} research tasks IN PARALLEL...")
-    print("   (Watch the Flyte UI to see them execute simultaneously!)")
+    # Bounds the research fanout so a long plan does not flood the search/LLM APIs
+    research_semaphore = asyncio.Semaphore(RESEARCH_CONCURRENCY)
 
     async def research_subtopic(subtopic: str, index: int) -> ResearchResult:
         """Research a single subtopic"""
-        print(f"\n   🔎 [{index}] Starting: {subtopic[:50]}...")
+        async with research_semaphore:
+            print(f"\n   🔎 [{index}] Starting: {subtopic[:50]}...")
 
-        search_query = f"{topic}: {subtopic}"
-        result = await web_search_agent(search_query)
+            search_query = f"{topic}: {subtopic}"
+            result = await web_search_agent(search_query)
 
         print(f"   ✅ [{index}] Complete: {len(result.summary)} chars")
 
-        await logger.log(
-            phase="research",
-            subtopic_index=index,
-            subtopic=subtopic,
-            findings_length=len(result.final_result),
-            summary_length=len(result.summary)
-        )
-
         return ResearchResult(
             subtopic=subtopic,
-            findings=result.final_result,
+            findings_length=len(result.final_result),
             summary=result.summary
         )
 
-    research_results = await asyncio.gather(*[
-        research_subtopic(subtopic, i)
-        for i, subtopic in enumerate(subtopics, 1)
-    ])
-
-    print(f"\n✅ All {len(research_results)} research tasks completed!")
+    out.print("\n🤔 Planning research strategy...")
+    out.flush()
+
+    # The plan is streamed and each subtopic's research starts as soon as it
+    # arrives. TaskGroup cancels the remaining searches if one of them fails.
+    async with asyncio.TaskGroup() as tg:
+        research_tasks: List[asyncio.Task] = []
+        offered = 0                     # Subtopics seen so far, duplicates included
+        unique_subtopics: List[str] = []
+
+        def start_research(subtopic: str):
+            # Near-duplicates would cost a full web search agent run each
+            nonlocal offered
+            offered += 1
+            if _is_duplicate_subtopic(subtopic, unique_subtopics):
+                return
+            unique_subtopics.append(subtopic)
+            research_tasks.append(tg.create_task(research_subtopic(subtopic, len(research_tasks) + 1)))
+
+        scanner = JsonObjectScanner()
+
+        def on_plan_chunk(delta: str):
+            for kind, key, value in scanner.feed(delta):
+                if kind == "item" and key == "subtopics":
+                    start_research(str(value))
+
+        raw_plan = await cached_chat(
+            client, "gpt-4o", 0.3, [{"role": "user", "content": planning_prompt}], use_cache,
+            on_chunk=on_plan_chunk
+        )
 
-    # Update report with research results
-    research_html = f"""
-    <div style="font-family: Arial, sans-serif; max-width: 1200px; margin: 0 auto; padding: 20px;">
-        <h1 style="color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px;">
-            🔍 Research Results
-        </h1>
-        <div style="background: #ecf0f1; padding: 15px; border-radius: 8px; margin: 20px 0;">
-            <h2 style="color: #34495e; margin-top: 0;">Topic: {topic}</h2>
-            <p><strong>Subtopics researched:</strong> {len(research_results)}</p>
-            <p><strong>Research approach:</strong> {research_approach}</p>
-        </div>
-"""
+        # Parse planning response
+        plan_data = parse_llm_json(raw_plan)
 
-    for i, result in enumerate(research_results, 1):
-        research_html += f"""
-        <div style="background: white; border-left: 4px solid #3498db; padding: 15px; margin: 15px 0; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-            <h3 style="color: #2980b9; margin-top: 0;">
-                {i}. {result.subtopic}
-            </h3>
-            <div style="color: #555; line-height: 1.6;">
-                {result.summary[:500]}{'...' if len(result.summary) > 500 else ''}
-            </div>
-            <p style="color: #7f8c8d; font-size: 0.9em; margin-top: 10px;">
-                ✓ {len(result.findings)} characters of research data
-            </p>
-        </div>
-"""
+        subtopics = plan_data["subtopics"]
+        research_approach = plan_data.get("research_approach", "Comprehensive research")
 
-    research_html += "</div>"
+        # Cached plans are not streamed; start whatever has not been started yet
+        for subtopic in subtopics[offered:]:
+            start_research(subtopic)
 
-    await flyte.report.replace.aio(research_html)
-    await flyte.report.flush.aio()
-    print("📊 Research results added to Flyte report!")
+        dropped = len(subtopics) - len(unique_subtopics)
+        subtopics = unique_subtopics
 
-    # ----------------------------------
-    # PHASE 3: SYNTHESIS (Map-Reduce Pattern)
-    # ----------------------------------
-    print(f"\n{'='*80}")
-    print("PHASE 3: SYNTHESIS 🔗 (Map-Reduce)")
-    print(f"{'='*80}")
+        out.print(f"\n✅ Research plan created!")
+        out.print(f"📊 Approach: {research_approach}")
+        out.print(f"📚 Subtopics to research ({len(subtopics)}):")
+        for i, subtopic in enumerate(subtopics, 1):
+            out.print(f"   {i}. {subtopic}")
+        if dropped:
+            out.print(f"   (skipped {dropped} near-duplicate subtopic(s))")
 
-    # Combine all research findings
-    combined_research = "\n\n".join([
-        f"## {r.subtopic}\n{r.summary}"
-        for r in research_results
+        await logger.log(
+            phase="planning",
+            subtopics_count=len(subtopics),
+            subtopics=subtopics,
+            approach=research_approach
+        )
+        await logger.log(phase="dedup", dropped=dropped)
+
+        # ----------------------------------
+        # PHASE 2: PARALLEL RESEARCH (Dynamic Fanout!)
+        # ----------------------------------
+        out.banner("PHASE 2: PARALLEL RESEARCH 🔍 (Dynamic Fanout)")
+        out.print(f"🚀 Running {len(research_tasks)} research tasks IN PARALLEL (up to {RESEARCH_CONCURRENCY} at once)...")
+        out.print("   (Watch the Flyte UI to see them execute simultaneously!)")
+        out.flush()
+
+    research_results = [task.result() for task in research_tasks]
+
+    # One batch for the whole fanout instead of a log call per task
+    await logger.log_batch([
+        {
+            "phase": "research",
+            "subtopic_index": i,
+            "subtopic": r.subtopic,
+            "findings_length": r.findings_length,
+            "summary_length": len(r.summary)
+        }
+        for i, r in enumerate(research_results, 1)
     ])
 
-    print(f"📊 Combined research: {len(combined_research)} characters")
-    print(f"📝 Creating structured synthesis...")
+    out.print(f"\n✅ All {len(research_results)} research tasks completed!")
 
-    synthesis_prompt = f"""Synthesize this research into a structured outline for a report:
+    # Combine all research findings
+    # Built once and shared by the synthesis and writing prompts
+    combined_research = "\n\n".join(f"## {r.subtopic}\n{r.summary}" for r in research_results)
 
-Topic: {topic}
+    synthesis_prompt = _SYNTHESIS_PROMPT_TMPL.format(topic=topic, combined_research=combined_research)
 
-Research Findings:
-{combined_research}
+    # Start synthesis now so the LLM call overlaps with the report update below
+    synthesis_task = asyncio.create_task(cached_chat(
+        client, "gpt-4o", 0.3, [{"role": "user", "content": synthesis_prompt}], use_cache
+    ))
 
-Create a structured outline with key points. Respond in JSON:
-{{
-  "main_themes": ["Theme 1", "Theme 2", "Theme 3"],
-  "key_findings": ["Finding 1", "Finding 2", "Finding 3"],
-  "suggested_structure": ["Section 1", "Section 2", "Section 3"]
-}}
-"""
+    # Update report with research results
+    research_parts = [_RESEARCH_HEADER_TMPL.substitute(
+        topic=html.escape(topic),
+        count=len(research_results),
+        approach=html.escape(research_approach)
+    )]
 
-    synthesis_response = await client.chat.completions.create(
-        model="gpt-4o",
-        temperature=0.3,
-        messages=[{"role": "user", "content": synthesis_prompt}]
-    )
+    for i, result in enumerate(research_results, 1):
+        summary = result.summary
+        preview = summary if len(summary) <= 500 else summary[:500] + "..."
+        research_parts.append(_RESEARCH_CARD_TMPL.substitute(
+            index=i,
+            subtopic=html.escape(result.subtopic),
+            summary=html.escape(preview),
+            findings_length=result.findings_length
+        ))
 
-    raw_synthesis = synthesis_response.choices[0].message.content
+    research_parts.append("</div>")
+    research_html = "".join(research_parts)
 
     try:
-        synthesis_data = json.loads(raw_synthesis)
-    except json.JSONDecodeError:
-        import re
-        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', raw_synthesis, re.DOTALL)
-        if json_match:
-            synthesis_data = json.loads(json_match.group(1))
-        else:
-            synthesis_data = {"main_themes": [], "key_findings": [], "suggested_structure": []}
-
-    print(f"✅ Synthesis complete!")
-    print(f"   Main themes: {len(synthesis_data.get('main_themes', []))}")
-    print(f"   Key findings: {len(synthesis_data.get('key_findings', []))}")
+        await flyte.report.replace.aio(research_html)
+        await flyte.report.flush.aio()
+    except BaseException:
+        # Don't leave the synthesis call running unobserved
+        synthesis_task.cancel()
+        raise
+    out.print("📊 Research results added to Flyte report!")
 
     # ----------------------------------
-    # PHASE 4: CONTENT GENERATION
+    # PHASE 3: SYNTHESIS (Map-Reduce Pattern)
     # ----------------------------------
-    print(f"\n{'='*80}")
-    print("PHASE 4: CONTENT GENERATION ✍️")
-    print(f"{'='*80}")
+    out.banner("PHASE 3: SYNTHESIS 🔗 (Map-Reduce)")
 
-    writing_task = f"""Write a comprehensive research report about: {topic}
+    out.print(f"📊 Combined research: {len(combined_research)} characters")
+    out.print(f"📝 Creating structured synthesis...")
+    out.flush()
 
-Research Findings:
-{combined_research}
+    raw_synthesis = await synthesis_task
+
+    try:
+        synthesis_data = parse_llm_json(raw_synthesis)
+    except ValueError:
+        synthesis_data = {"main_themes": [], "key_findings": [], "suggested_structure": []}
 
-Main Themes: {', '.join(synthesis_data.get('main_themes', []))}
+    out.print(f"✅ Synthesis complete!")
+    out.print(f"   Main themes: {len(synthesis_data.get('main_themes', []))}")
+    out.print(f"   Key findings: {len(synthesis_data.get('key_findings', []))}")
 
-Requirements:
-- Engaging title
-- Well-structured sections
-- 500-700 words
-- Include key findings from research
-- Professional tone
-- Proper markdown formatting
-"""
+    # ----------------------------------
+    # PHASE 4: CONTENT GENERATION
+    # ----------------------------------
+    out.banner("PHASE 4: CONTENT GENERATION ✍️")
 
-    print("\n✍️  Generating initial report...")
+    writing_task = _WRITING_PROMPT_TMPL.format(
+        topic=topic,
+        combined_research=combined_research,
+        themes=", ".join(synthesis_data.get("main_themes", []))
+    )
+
+    out.print("\n✍️  Generating initial report...")
+    out.flush()
     draft_result = await writer_agent(writing_task)
     current_content = draft_result.final_result
 
-    print(f"✅ Draft complete: {len(current_content)} characters")
-    print(f"\n📄 Draft preview:\n{current_content[:200]}...\n")
+    out.print(f"✅ Draft complete: {len(current_content)} characters")
+    out.print(f"\n📄 Draft preview:\n{current_content[:200]}...\n")
 
     # ----------------------------------
     # PHASE 5: QUALITY ITERATION (Reflexion Loop!)
     # ----------------------------------
-    print(f"\n{'='*80}")
-    print("PHASE 5: QUALITY ITERATION 🔄 (Reflexion Loop)")
-    print(f"{'='*80}")
-    print("   (Watch quality scores improve with each iteration!)")
+    out.banner("PHASE 5: QUALITY ITERATION 🔄 (Reflexion Loop)")
+    out.print("   (Watch quality scores improve with each iteration!)")
 
     quality_iterations: List[QualityIteration] = []
+    iteration_logs: List[dict] = []  # Logged as one batch after the loop
     final_quality_score = 0.0
+    # Best-scoring draft so far; a revision that scores lower never replaces it
+    best_content = current_content
+    previous_score = None
+    stop_reason = "max_iterations"
 
     for iter_num in range(1, max_quality_iterations + 1):
-        print(f"\n{'─'*80}")
-        print(f"Iteration {iter_num}/{max_quality_iterations}")
-        print(f"{'─'*80}")
+        out.print(f"\n{'─'*80}\nIteration {iter_num}/{max_quality_iterations}\n{'─'*80}")
 
         # Critique the content
-        critique_prompt = f"""Evaluate this research report:
+        critique_prompt = _CRITIQUE_PROMPT_TMPL.format(content=current_content)
 
-{current_content}
+        out.print("🔍 Critiquing content...")
+        out.flush()
 
-Rate on these criteria (0-10):
-1. Clarity - Easy to understand?
-2. Structure - Well organized?
-3. Completeness - Covers topic thoroughly?
-4. Accuracy - Information correct?
-5. Engagement - Interesting to read?
-
-Respond in JSON:
-{{
-  "overall_score": 8.5,
-  "clarity_score": 9.0,
-  "structure_score": 8.0,
-  "completeness_score": 8.5,
-  "accuracy_score": 9.0,
-  "engagement_score": 8.0,
-  "strengths": ["strength 1", "strength 2"],
-  "weaknesses": ["weakness 1", "weakness 2"],
-  "specific_improvements": "Detailed suggestions..."
-}}
-"""
-
-        print("🔍 Critiquing content...")
-
-        critique_response = await client.chat.completions.create(
-            model="gpt-4o",
-            temperature=0.3,
-            messages=[{"role": "user", "content": critique_prompt}]
+        raw_critique = await cached_chat(
+            client, "gpt-4o", 0.3, [{"role": "user", "content": critique_prompt}], use_cache
         )
 
-        raw_critique = critique_response.choices[0].message.content
-
         try:
-            critique_data = json.loads(raw_critique)
-        except json.JSONDecodeError:
-            import re
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', raw_critique, re.DOTALL)
-            if json_match:
-                critique_data = json.loads(json_match.group(1))
-            else:
-                critique_data = {
-                    "overall_score": 7.0,
-                    "strengths": [],
-                    "weaknesses": [],
-                    "specific_improvements": "Could not parse critique"
-                }
+            critique_data = parse_llm_json(raw_critique)
+        except ValueError:
+            critique_data = {
+                "overall_score": 7.0,
+                "strengths": [],
+                "weaknesses": [],
+                "specific_improvements": "Could not parse critique"
+            }
 
         quality_score = critique_data.get("overall_score", 7.0)
         strengths = critique_data.get("strengths", [])
         weaknesses = critique_data.get("weaknesses", [])
         improvements = critique_data.get("specific_improvements", "")
 
-        print(f"\n📊 Quality Score: {quality_score}/10")
-        print(f"✅ Strengths: {', '.join(strengths)}")
-        print(f"⚠️  Weaknesses: {', '.join(weaknesses)}")
-        print(f"💡 Improvements: {improvements[:100]}...")
+        out.print(f"\n📊 Quality Score: {quality_score}/10")
+        out.print(f"✅ Strengths: {', '.join(strengths)}")
+        out.print(f"⚠️  Weaknesses: {', '.join(weaknesses)}")
+        out.print(f"💡 Improvements: {improvements[:100]}...")
 
         critique_text = f"""Score: {quality_score}/10
 Strengths: {', '.join(strengths)}
@@ -428,152 +591,130 @@ Improvements: {improvements}"""
             iteration_number=iter_num,
             quality_score=quality_score,
             critique=critique_text,
-            content=current_content
+            content=current_content,
+            strengths=strengths,
+            weaknesses=weaknesses,
+            improvements=improvements
         ))
 
-        final_quality_score = quality_score
+        if iter_num == 1 or quality_score > final_quality_score:
+            final_quality_score = quality_score
+            best_content = current_content
 
-        await logger.log(
-            phase="quality_iteration",
-            iteration=iter_num,
-            quality_score=quality_score,
-            strengths=strengths,
-            weaknesses=weaknesses
-        )
+        iteration_logs.append({
+            "phase": "quality_iteration",
+            "iteration": iter_num,
+            "quality_score": quality_score,
+            "strengths": strengths,
+            "weaknesses": weaknesses
+        })
 
         # Check if threshold met
         if quality_score >= quality_threshold:
-            print(f"\n✅ Quality threshold met! ({quality_score} >= {quality_threshold})")
+            out.print(f"\n✅ Quality threshold met! ({quality_score} >= {quality_threshold})")
+            stop_reason = "threshold"
             break
 
+        # Stop when revising no longer raises the score meaningfully
+        if previous_score is not None and quality_score - previous_score < MIN_SCORE_GAIN:
+            out.print(f"\n⏹️  Score plateaued ({previous_score} -> {quality_score}), stopping revisions")
+            stop_reason = "plateau"
+            break
+        previous_score = quality_score
+
         # If not done, revise
         if iter_num < max_quality_iterations:
-            print(f"\n🔄 Revising content (target: {quality_threshold}/10)...")
-
-            revision_task = f"""Improve this content:
+            out.print(f"\n🔄 Revising content (target: {quality_threshold}/10)...")
+            out.flush()
 
-{current_content}
-
-Critique:
-{critique_text}
-
-Address all weaknesses and apply suggestions. Return ONLY the improved content.
-"""
+            revision_task = _REVISION_PROMPT_TMPL.format(content=current_content, critique=critique_text)
 
             revision_result = await editor_agent(revision_task)
             current_content = revision_result.final_result
 
-            print(f"✅ Revision complete")
+            out.print(f"✅ Revision complete")
+
+    await logger.log_batch(iteration_logs)
+
+    # Report the best draft, not necessarily the last revision
+    current_content = best_content
 
     # ----------------------------------
     # FINAL OUTPUT
     # ----------------------------------
-    print(f"\n{'='*80}")
-    print("🎉 WORKFLOW COMPLETE!")
-    print(f"{'='*80}")
-    print(f"📊 Research Tasks: {len(research_results)}")
-    print(f"🔄 Quality Iterations: {len(quality_iterations)}")
-    print(f"⭐ Final Quality Score: {final_quality_score}/10")
-    print(f"{'='*80}")
-
-    print(f"\n{'='*80}")
-    print("📄 FINAL REPORT:")
-    print(f"{'='*80}")
-    print(current_content)
-    print(f"{'='*80}\n")
+    out.banner("🎉 WORKFLOW COMPLETE!")
+    out.print(f"📊 Research Tasks: {len(research_results)}")
+    out.print(f"🔄 Quality Iterations: {len(quality_iterations)}")
+    out.print(f"⭐ Final Quality Score: {final_quality_score}/10")
+
+    # The full report is also in the Flyte report tab and the returned result
+    if VERBOSE:
+        out.print(f"{'='*80}")
+        out.banner("📄 FINAL REPORT:")
+        out.print(current_content)
+        out.print(f"{'='*80}\n")
 
     await logger.log(
         phase="completion",
         total_research_tasks=len(research_results),
         total_quality_iterations=len(quality_iterations),
         final_quality_score=final_quality_score,
-        final_report_length=len(current_content)
+        final_report_length=len(current_content),
+        stop_reason=stop_reason
     )
 
     # Create comprehensive final report with quality tracking
     quality_tab = flyte.report.get_tab("Quality Iterations")
 
-    quality_html = f"""
-    <div style="font-family: Arial, sans-serif; max-width: 1200px; margin: 0 auto; padding: 20px;">
-        <h1 style="color: #2c3e50; border-bottom: 3px solid #e74c3c; padding-bottom: 10px;">
-            📊 Quality Improvement Tracking
-        </h1>
-        <div style="background: #ecf0f1; padding: 15px; border-radius: 8px; margin: 20px 0;">
-            <h2 style="color: #34495e; margin-top: 0;">Quality Progression</h2>
-            <p><strong>Target threshold:</strong> {quality_threshold}/10</p>
-            <p><strong>Total iterations:</strong> {len(quality_iterations)}</p>
-            <p><strong>Final score:</strong> <span style="color: #27ae60; font-size: 1.3em; font-weight: bold;">{final_quality_score}/10</span></p>
-            <p><strong>Status:</strong> {'✅ Threshold met!' if final_quality_score >= quality_threshold else '⚠️ Max iterations reached'}</p>
-        </div>
-"""
+    quality_parts = [_QUALITY_HEADER_TMPL.substitute(
+        threshold=quality_threshold,
+        iterations=len(quality_iterations),
+        score=final_quality_score,
+        status=STOP_REASON_STATUS[stop_reason]
+    )]
 
     for iteration in quality_iterations:
-        critique_data = {}
-        for line in iteration.critique.split('\n'):
-            if ':' in line:
-                key, value = line.split(':', 1)
-                critique_data[key.strip()] = value.strip()
-
         score = iteration.quality_score
         color = "#27ae60" if score >= quality_threshold else "#e74c3c" if score < 7 else "#f39c12"
+        improvements = iteration.improvements or "N/A"
+        preview = improvements if len(improvements) <= 200 else improvements[:200] + "..."
+
+        quality_parts.append(_QUALITY_CARD_TMPL.substitute(
+            color=color,
+            iteration=iteration.iteration_number,
+            score=score,
+            strengths=html.escape(", ".join(iteration.strengths) or "N/A"),
+            weaknesses=html.escape(", ".join(iteration.weaknesses) or "N/A"),
+            improvements=html.escape(preview)
+        ))
 
-        quality_html += f"""
-        <div style="background: white; border-left: 4px solid {color}; padding: 15px; margin: 15px 0; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-            <h3 style="color: #2c3e50; margin-top: 0;">
-                Iteration {iteration.iteration_number}
-                <span style="float: right; color: {color}; font-size: 1.2em;">{score}/10</span>
-            </h3>
-            <div style="margin: 10px 0;">
-                <p style="margin: 5px 0;"><strong>Strengths:</strong> {critique_data.get('Strengths', 'N/A')}</p>
-                <p style="margin: 5px 0;"><strong>Weaknesses:</strong> {critique_data.get('Weaknesses', 'N/A')}</p>
-                <p style="margin: 5px 0;"><strong>Improvements:</strong> {critique_data.get('Improvements', 'N/A')[:200]}...</p>
-            </div>
-        </div>
-"""
-
-    quality_html += "</div>"
+    quality_parts.append("</div>")
+    quality_html = "".join(quality_parts)
     quality_tab.log(quality_html)
 
     # Create final report tab with markdown content
     report_tab = flyte.report.get_tab("Final Report")
 
     # Convert markdown to basic HTML for better display
-    import re
-    html_content = current_content
-    # Convert # headers
-    html_content = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html_content, flags=re.MULTILINE)
-    html_content = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html_content, flags=re.MULTILINE)
-    html_content = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html_content, flags=re.MULTILINE)
-    # Convert paragraphs
-    html_content = re.sub(r'\n\n', r'</p><p>', html_content)
+    # Convert #, ## and ### headers in one pass, then paragraphs
+    html_content = _HEADER_RE.sub(_header_html, html.escape(current_content, quote=False))
+    html_content = _PARA_RE.sub("</p><p>", html_content)
     html_content = f"<p>{html_content}</p>"
 
-    final_report_html = f"""
-    <div style="font-family: Georgia, serif; max-width: 800px; margin: 0 auto; padding: 20px; background: white;">
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 8px 8px 0 0; margin: -20px -20px 20px -20px;">
-            <h1 style="margin: 0; font-size: 2em;">📄 Research Report</h1>
-            <p style="margin: 10px 0 0 0; opacity: 0.9;">Topic: {topic}</p>
-            <p style="margin: 5px 0 0 0; opacity: 0.9;">Quality Score: {final_quality_score}/10 | {len(research_results)} sources researched</p>
-        </div>
-        <div style="line-height: 1.8; color: #333;">
-            {html_content}
-        </div>
-        <div style="margin-top: 40px; padding: 20px; background: #f8f9fa; border-radius: 8px; border-left: 4px solid #667eea;">
-            <h3 style="margin-top: 0;">Workflow Statistics</h3>
-            <ul style="list-style: none; padding: 0;">
-                <li>🔍 <strong>Research Tasks:</strong> {len(research_results)} parallel searches</li>
-                <li>📊 <strong>Quality Iterations:</strong> {len(quality_iterations)} refinement cycles</li>
-                <li>⭐ <strong>Final Score:</strong> {final_quality_score}/10</li>
-                <li>📝 <strong>Content Length:</strong> {len(current_content)} characters</li>
-            </ul>
-        </div>
-    </div>
-"""
+    final_report_html = _FINAL_WRAPPER_TMPL.substitute(
+        topic=html.escape(topic),
+        score=final_quality_score,
+        sources=len(research_results),
+        content=html_content,
+        iterations=len(quality_iterations),
+        length=len(current_content)
+    )
 
     report_tab.log(final_report_html)
 
     await flyte.report.flush.aio()
-    print("📊 Final report with quality tracking added to Flyte UI!")
+    out.print("📊 Final report with quality tracking added to Flyte UI!")
+    out.flush()
 
     return ResearchWorkflowResult(
         topic=topic,
@@ -583,10 +724,38 @@ Address all weaknesses and apply suggestions. Return ONLY the improved content.
         final_report=current_content,
         final_quality_score=final_quality_score,
         total_research_tasks=len(research_results),
-        total_quality_iterations=len(quality_iterations)
+        total_quality_iterations=len(quality_iterations),
+        stop_reason=stop_reason
     )
 
 
+async def cached_chat(
+    client: AsyncOpenAI,
+    model: str,
+    temperature: float,
+    messages: list,
+    use_cache: bool = True,
+    on_chunk: Optional[Callable[[str], None]] = None
+) -> str:
+    """
+    Return the message content of a chat completion, through the report cache unless use_cache is False.
+
+    Identical (model, temperature, messages) requests are answered from disk,
+    so re-running the workflow on the same topic skips the LLM round-trips.
+    With `on_chunk`, a response that is not cached is streamed and each content
+    delta is passed to the callback as it arrives.
+    """
+    if use_cache:
+        return await get_report_cache().chat(
+            client, model=model, messages=messages, temperature=temperature,
+            label="[Report Cache]", on_chunk=on_chunk
+        )
+    if on_chunk is not None:
+        return await stream_chat(client, on_chunk, model=model, temperature=temperature, messages=messages)
+    response = await client.chat.completions.create(model=model, temperature=temperature, messages=messages)
+    return response.choices[0].message.content
+
+
 # ----------------------------------
 # CLI Entry Point
 # ----------------------------------
@@ -621,12 +790,23 @@ if __name__ == "__main__":
         default=3,
         help="Maximum quality refinement iterations (default: 3)"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the LLM instead of reusing cached planning/synthesis/critique responses"
+    )
 
     args = parser.parse_args()
 
     # Initialize Flyte
     if args.local:
         print("🏠 Running LOCALLY with flyte.init()")
+        # uvloop is optional; it lowers per-callback overhead of the local event loop
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
         flyte.init()
     else:
         print("☁️  Running REMOTELY with flyte.init_from_config()")
@@ -645,7 +825,8 @@ if __name__ == "__main__":
         research_report_workflow,
         topic=args.topic,
         quality_threshold=args.quality_threshold,
-        max_quality_iterations=args.max_quality_iterations
+        max_quality_iterations=args.max_quality_iterations,
+        use_cache=not args.no_cache
     )
 
     print(f"\n{'='*80}")
@@ -26,7 +26,7 @@ Usage:
 
 import flyte
 from agents.web_search_agent import web_search_agent
-from config import base_env
+from config import base_env, VERBOSE
 
 # ----------------------------------
 # The Workflow
@@ -48,21 +48,24 @@ async def simple_agent_workflow(query: str) -> str:
     Returns:
         A summary of what the agent found
     """
-    print("=" * 80)
-    print("🤖 SIMPLE AI AGENT WORKFLOW")
-    print("=" * 80)
-    print(f"\n📋 Question: {query}\n")
+    if VERBOSE:
+        print("=" * 80)
+        print("🤖 SIMPLE AI AGENT WORKFLOW")
+        print("=" * 80)
+        print(f"\n📋 Question: {query}\n")
 
     # Call the web search agent
     # This is what makes it an AGENT - it uses TOOLS!
     # The LLM will decide to use the duck_duck_go tool to search the web
-    print("🔍 Agent is searching the web (using DuckDuckGo tool)...")
+    if VERBOSE:
+        print("🔍 Agent is searching the web (using DuckDuckGo tool)...")
     result = await web_search_agent(query)
 
-    print(f"\n✅ Search complete!")
-    print(f"📊 Found information: {len(result.final_result)} characters")
-    print(f"\n💡 Summary of findings:\n{result.summary}\n")
-    print("=" * 80)
+    if VERBOSE:
+        print(f"\n✅ Search complete!")
+        print(f"📊 Found information: {len(result.final_result)} characters")
+        print(f"\n💡 Summary of findings:\n{result.summary}\n")
+        print("=" * 80)
 
     return result.summary
 